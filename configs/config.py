@@ -3,9 +3,26 @@ Shared configuration for RAG system with Pinecone and Gemini.
 """
 
 import os
+from functools import cached_property, lru_cache
+
 import google.generativeai as genai
 from pinecone import Pinecone, ServerlessSpec
 
+try:
+    from pinecone.grpc import PineconeGRPC  # optional: pinecone[grpc], persistent HTTP/2 channel
+except ImportError:
+    PineconeGRPC = None
+
+
+@lru_cache(maxsize=4096)
+def _count_tokens_exact(gemini_model, text: str) -> int:
+    """Count tokens with the Gemini API, memoized per (model, text)."""
+    return gemini_model.count_tokens(text).total_tokens
+
+
+# (Pinecone API key, index name) pairs confirmed to exist during this process
+_EXISTING_INDEXES = set()
+
 
 class RAGConfig:
     """Configuration for RAG Assistant with Pinecone and Gemini."""
@@ -18,6 +35,9 @@ class RAGConfig:
         model: str = "models/gemini-2.0-flash",
         embedding_model: str = "models/text-embedding-004",
         embedding_dimension: int = 768,
+        embedding_max_workers: int = 8,
+        embedding_cache_path: str = None,
+        use_grpc: bool = False,
         cloud: str = "aws",
         region: str = "us-east-1"
     ):
@@ -31,75 +51,126 @@ class RAGConfig:
             model: Gemini model for text generation (gemini-1.5-flash-latest, gemini-1.5-pro-latest, gemini-pro)
             embedding_model: Gemini embedding model
             embedding_dimension: Dimension of embedding vectors (768 for text-embedding-004)
+            embedding_max_workers: Maximum number of concurrent embedding requests during ingestion
+            embedding_cache_path: SQLite file for caching document embeddings across ingestions (disabled if None)
+            use_grpc: Talk to Pinecone over gRPC (requires the pinecone[grpc] extra, falls back to REST otherwise)
             cloud: Cloud provider for Pinecone serverless (aws, gcp, azure)
             region: Region for Pinecone serverless
         """
-        # Initialize Gemini
+        # Validate credentials up front; clients are created lazily on first use
         gemini_key = gemini_api_key or os.getenv("GEMINI_API_KEY")
         if not gemini_key:
             raise ValueError("Gemini API key must be provided or set as GEMINI_API_KEY environment variable")
 
+        pinecone_key = pinecone_api_key or os.getenv("PINECONE_API_KEY")
+        if not pinecone_key:
+            raise ValueError("Pinecone API key must be provided or set as PINECONE_API_KEY environment variable")
+
+        # Configuring the SDK is local only; embed_content relies on it even if no model is built
         genai.configure(api_key=gemini_key)
 
+        self.model_name = model
+        self.embedding_model = embedding_model
+        self.embedding_dimension = embedding_dimension
+        self.embedding_max_workers = embedding_max_workers
+        self.embedding_cache_path = embedding_cache_path
+        self.use_grpc = use_grpc
+        self.index_name = index_name
+        self.cloud = cloud
+        self.region = region
+        self._pinecone_key = pinecone_key
+
+    @cached_property
+    def gemini_model(self):
+        """Gemini generative model, initialized on first access."""
         # Try to initialize the model, fall back to gemini-pro if the specified model is not available
         try:
-            self.gemini_model = genai.GenerativeModel(model)
-            print(f"Successfully initialized model: {model}")
+            gemini_model = genai.GenerativeModel(self.model_name)
+            print(f"Successfully initialized model: {self.model_name}")
         except Exception as e:
-            print(f"Warning: Could not initialize {model}, falling back to gemini-pro. Error: {e}")
+            print(f"Warning: Could not initialize {self.model_name}, falling back to gemini-pro. Error: {e}")
             try:
-                self.gemini_model = genai.GenerativeModel("gemini-pro")
+                gemini_model = genai.GenerativeModel("gemini-pro")
                 print("Successfully initialized fallback model: gemini-pro")
             except Exception as e2:
                 raise ValueError(f"Could not initialize any Gemini model. Error: {e2}")
+        return gemini_model
 
-        self.embedding_model = embedding_model
-        self.embedding_dimension = embedding_dimension
+    @cached_property
+    def pc(self) -> Pinecone:
+        """Pinecone client (gRPC if requested and installed), initialized on first access."""
+        if self.use_grpc:
+            if PineconeGRPC is not None:
+                return PineconeGRPC(api_key=self._pinecone_key)
+            print("Warning: use_grpc requires 'pinecone[grpc]', falling back to the REST client")
+        return Pinecone(api_key=self._pinecone_key)
 
-        # Initialize Pinecone
-        pinecone_key = pinecone_api_key or os.getenv("PINECONE_API_KEY")
-        if not pinecone_key:
-            raise ValueError("Pinecone API key must be provided or set as PINECONE_API_KEY environment variable")
+    @cached_property
+    def index(self):
+        """Pinecone index, created if missing and connected on first access."""
+        # Create index if it doesn't exist (checked once per process per index)
+        index_key = (self._pinecone_key, self.index_name)
+        if index_key not in _EXISTING_INDEXES:
+            if not self._index_exists():
+                print(f"Creating new Pinecone index: {self.index_name}")
+                self.pc.create_index(
+                    name=self.index_name,
+                    dimension=self.embedding_dimension,
+                    metric="cosine",
+                    spec=ServerlessSpec(
+                        cloud=self.cloud,
+                        region=self.region
+                    )
+                )
+                print(f"Index {self.index_name} created successfully!")
+            else:
+                print(f"Using existing Pinecone index: {self.index_name}")
+            _EXISTING_INDEXES.add(index_key)
 
-        self.pc = Pinecone(api_key=pinecone_key)
-        self.index_name = index_name
+        # Connect to the index (pool_threads enables concurrent async_req upserts)
+        return self.pc.Index(self.index_name, pool_threads=30)
 
-        # Create index if it doesn't exist
-        existing_indexes = [idx.name for idx in self.pc.list_indexes()]
-        if index_name not in existing_indexes:
-            print(f"Creating new Pinecone index: {index_name}")
-            self.pc.create_index(
-                name=index_name,
-                dimension=embedding_dimension,
-                metric="cosine",
-                spec=ServerlessSpec(
-                    cloud=cloud,
-                    region=region
-                )
-            )
-            print(f"Index {index_name} created successfully!")
-        else:
-            print(f"Using existing Pinecone index: {index_name}")
+    @cached_property
+    def vector_store(self):
+        """Vector store over the index, shared by ingestion and retrieval, initialized on first access."""
+        # Imported here: data_handling imports this module, so a top-level import would be circular
+        from data_handling.embedding_cache import EmbeddingCache
+        from data_handling.vector_store import VectorStore
+
+        embedding_cache = EmbeddingCache(self.embedding_cache_path) if self.embedding_cache_path else None
+        return VectorStore(
+            self.index,
+            self.embedding_model,
+            embedding_max_workers=self.embedding_max_workers,
+            embedding_cache=embedding_cache
+        )
 
-        # Connect to the index
-        self.index = self.pc.Index(index_name)
+    def _index_exists(self) -> bool:
+        """Check whether the configured index exists, preferring the SDK's direct lookup."""
+        if hasattr(self.pc, "has_index"):
+            return self.pc.has_index(self.index_name)
+        return self.index_name in [idx.name for idx in self.pc.list_indexes()]
 
-    def count_tokens(self, text: str) -> int:
+    def count_tokens(self, text: str, exact: bool = False) -> int:
         """
-        Count tokens for the given text using the model's tokenizer.
+        Count tokens for the given text.
+
+        By default this uses a character-based estimate, which avoids a network
+        round-trip per call. Pass exact=True to use the model's tokenizer.
 
         Args:
             text: Text to count tokens for
+            exact: Whether to ask the Gemini API for the exact token count
 
         Returns:
             Number of tokens
         """
-        try:
-            # Use Gemini's native token counting
-            result = self.gemini_model.count_tokens(text)
-            return result.total_tokens
-        except Exception as e:
-            # Fallback estimation if API fails
-            # Gemini models: approximately 1 token ≈ 4 characters (similar to GPT)
-            print(f"Warning: Token counting failed ({e}), using estimation")
-            return len(text) // 4
\ No newline at end of file
+        if exact:
+            try:
+                # Use Gemini's native token counting (cached, so repeated texts don't hit the API)
+                return _count_tokens_exact(self.gemini_model, text)
+            except Exception as e:
+                print(f"Warning: Token counting failed ({e}), using estimation")
+
+        # Gemini models: approximately 1 token ≈ 4 characters (similar to GPT)
+        return max(1, len(text) // 4)
\ No newline at end of file
@@ -5,14 +5,17 @@ Modular components for document ingestion, embedding generation,
 and vector database operations for the Incident Copilot system.
 """
 
-from .embeddings import embed_documents, embed_query
+from .embeddings import aembed_documents, embed_documents, embed_query
+from .embedding_cache import EmbeddingCache
 from .vector_store import VectorStore
 from .incident_parser import IncidentReportParser
 from .ingestion_pipeline import IngestionPipeline
 
 __all__ = [
     'embed_documents',
+    'aembed_documents',
     'embed_query',
+    'EmbeddingCache',
     'VectorStore',
     'IncidentReportParser',
     'IngestionPipeline'
@@ -4,33 +4,139 @@ Document Parser Module
 Generic utilities for parsing and extracting sections from documents.
 """
 
-import re
-from typing import List
+from bisect import bisect_left
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+try:
+    import ahocorasick  # optional: pyahocorasick, locates all headers in one pass
+except ImportError:
+    ahocorasick = None
+
+# Headers are ASCII; used when str.lower() would change the text length
+_ASCII_LOWER = str.maketrans('ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz')
+
+
+def normalize_headers(headers: Sequence[str]) -> Tuple[str, ...]:
+    """
+    Lowercase literal section headers for case-insensitive matching.
+
+    Args:
+        headers: Literal header strings (e.g. "Impact Assessment:")
+
+    Returns:
+        Lowercased headers as an immutable tuple, in the same order
+    """
+    return tuple(header.lower() for header in headers)
+
+
+@lru_cache(maxsize=128)
+def _normalize_header_tuple(headers: Tuple[str, ...]) -> Tuple[str, ...]:
+    """normalize_headers for hashable header tuples, computed once per distinct tuple."""
+    return normalize_headers(headers)
+
+
+def _lowercase_headers(headers: Sequence[str]) -> Tuple[str, ...]:
+    """Lowercased headers; tuples (e.g. pre-normalized section configs) hit a cache."""
+    if isinstance(headers, tuple):
+        return _normalize_header_tuple(headers)
+    return normalize_headers(headers)
+
+
+def lower_text(text: str) -> str:
+    """
+    Lowercase text while keeping character offsets aligned with the original.
+
+    Args:
+        text: Document text
+
+    Returns:
+        Lowercased text of the same length as text
+    """
+    text_lower = text.lower()
+    if len(text_lower) != len(text):
+        # A few non-ASCII characters expand when lowercased; fold ASCII only
+        text_lower = text.translate(_ASCII_LOWER)
+    return text_lower
+
+
+@lru_cache(maxsize=32)
+def _header_automaton(headers: Tuple[str, ...]):
+    """Build (once per header set) an Aho-Corasick automaton over lowercased headers."""
+    automaton = ahocorasick.Automaton()
+    for header in headers:
+        automaton.add_word(header, header)
+    automaton.make_automaton()
+    return automaton
+
+
+def locate_headers(text_lower: str, headers: Tuple[str, ...]) -> Optional[Dict[str, List[int]]]:
+    """
+    Find every occurrence of each header in a single pass over the text.
+
+    Args:
+        text_lower: Lowercased document text (see lower_text)
+        headers: Lowercased headers to locate
+
+    Returns:
+        Dictionary mapping each header to its sorted start offsets, or None if
+        pyahocorasick is not installed (extract_section then searches directly)
+    """
+    if ahocorasick is None:
+        return None
+
+    positions = {header: [] for header in headers}
+    for end_index, header in _header_automaton(headers).iter(text_lower):
+        positions[header].append(end_index - len(header) + 1)
+    return positions
+
+
+def _find_header(
+        text_lower: str,
+        header: str,
+        start: int,
+        header_positions: Optional[Dict[str, List[int]]]
+) -> int:
+    """Offset of the first occurrence of header at or after start, or -1."""
+    if header_positions is None:
+        return text_lower.find(header, start)
+    offsets = header_positions[header]
+    i = bisect_left(offsets, start)
+    return offsets[i] if i < len(offsets) else -1
 
 
 def extract_section(
         text: str,
-        section_headers: List[str],
-        next_section_headers: List[str]
+        section_headers: Sequence[str],
+        next_section_headers: Sequence[str],
+        text_lower: Optional[str] = None,
+        header_positions: Optional[Dict[str, List[int]]] = None
 ) -> str:
     """
-    Extract a specific section from a document using regex patterns.
+    Extract a specific section from a document using case-insensitive header search.
 
     Args:
         text: Full document text
-        section_headers: Possible headers marking the start of the section
-        next_section_headers: Headers that mark the end of this section
+        section_headers: Headers marking the start of the section (any case)
+        next_section_headers: Headers that mark the end of this section (any case)
+        text_lower: Precomputed lower_text(text), to share across several extractions
+        header_positions: Precomputed locate_headers() result covering all headers used (optional)
 
     Returns:
         Extracted section text (empty string if not found)
     """
+    if text_lower is None:
+        text_lower = lower_text(text)
+
+    section_headers = _lowercase_headers(section_headers)
+    next_section_headers = _lowercase_headers(next_section_headers)
+
     # Try each possible section header
     start_pos = -1
     for header in section_headers:
-        pattern = re.escape(header) + r'\s*'
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            start_pos = match.end()
+        header_pos = _find_header(text_lower, header, 0, header_positions)
+        if header_pos != -1:
+            start_pos = header_pos + len(header)
             break
 
     if start_pos == -1:
@@ -41,11 +147,9 @@ def extract_section(
 
     if next_section_headers:
         for next_header in next_section_headers:
-            next_pattern = re.escape(next_header) + r'\s*'
-            next_match = re.search(next_pattern, text[start_pos:], re.IGNORECASE)
-            if next_match:
-                potential_end = start_pos + next_match.start()
-                end_pos = min(end_pos, potential_end)
+            next_pos = _find_header(text_lower, next_header, start_pos, header_positions)
+            if next_pos != -1:
+                end_pos = min(end_pos, next_pos)
 
     section_text = text[start_pos:end_pos].strip()
     return section_text
\ No newline at end of file
@@ -0,0 +1,91 @@
+"""
+Embedding Cache Module
+
+Persistent, content-addressed cache of document embeddings so unchanged
+texts are not re-embedded across ingestion runs.
+"""
+
+import sqlite3
+import threading
+from hashlib import blake2b
+from typing import Dict, List
+
+import numpy as np
+
+# SQLite's default limit on bound parameters per statement is 999
+_LOOKUP_CHUNK_SIZE = 500
+
+
+class EmbeddingCache:
+    """SQLite-backed cache mapping (embedding model, text) hashes to float32 embeddings."""
+
+    def __init__(self, path: str = "embedding_cache.sqlite"):
+        """
+        Open (or create) the embedding cache.
+
+        Args:
+            path: Path to the SQLite database file
+        """
+        self.path = path
+        # The cache may be created lazily in a workflow worker thread and used later from
+        # another one, so the connection is shared across threads and guarded by a lock
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, embedding BLOB NOT NULL)"
+        )
+        self.conn.commit()
+
+    @staticmethod
+    def content_hash(embedding_model: str, text: str) -> str:
+        """Hash a text together with the model name, so switching models never reuses stale vectors."""
+        return blake2b(f"{embedding_model}\0{text}".encode('utf-8'), digest_size=16).hexdigest()
+
+    def get_many(self, embedding_model: str, texts: List[str]) -> Dict[str, np.ndarray]:
+        """
+        Look up cached embeddings.
+
+        Args:
+            embedding_model: Model name the embeddings were generated with
+            texts: Document texts to look up
+
+        Returns:
+            Dictionary mapping each cached text to its embedding (misses are omitted)
+        """
+        key_to_text = {self.content_hash(embedding_model, text): text for text in texts}
+        keys = list(key_to_text)
+
+        found = {}
+        with self._lock:
+            for start in range(0, len(keys), _LOOKUP_CHUNK_SIZE):
+                chunk = keys[start:start + _LOOKUP_CHUNK_SIZE]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self.conn.execute(
+                    f"SELECT key, embedding FROM embeddings WHERE key IN ({placeholders})", chunk
+                )
+                for key, blob in rows:
+                    found[key_to_text[key]] = np.frombuffer(blob, dtype=np.float32)
+        return found
+
+    def put_many(self, embedding_model: str, texts: List[str], embeddings: np.ndarray):
+        """
+        Store embeddings for the given texts.
+
+        Args:
+            embedding_model: Model name the embeddings were generated with
+            texts: Document texts
+            embeddings: Embedding vectors, one row per text
+        """
+        with self._lock, self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, embedding) VALUES (?, ?)",
+                (
+                    (self.content_hash(embedding_model, text), np.asarray(embedding, dtype=np.float32).tobytes())
+                    for text, embedding in zip(texts, embeddings)
+                )
+            )
+
+    def close(self):
+        """Close the underlying database connection."""
+        with self._lock:
+            self.conn.close()
\ No newline at end of file
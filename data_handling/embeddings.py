@@ -5,35 +5,157 @@ Handles generation of embeddings for both documents (ingestion)
 and queries (retrieval) using Google Generative AI.
 """
 
-from typing import List
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional
 import google.generativeai as genai
+import numpy as np
 
+from data_handling.embedding_cache import EmbeddingCache
+from data_handling.retry import retry_with_backoff
 
-def embed_documents(documents: List[str], embedding_model: str) -> List[List[float]]:
+
+def _is_rate_limited(error: Exception) -> bool:
+    """Whether a Gemini API error is an HTTP 429 (resource exhausted) response."""
+    return getattr(error, 'code', None) == 429
+
+
+def chunks(iterable: Iterable, batch_size: int = 100) -> Iterator[list]:
+    """
+    Split an iterable into lists of at most batch_size items.
+
+    Args:
+        iterable: Items to split
+        batch_size: Maximum number of items per chunk
+
+    Returns:
+        Iterator over consecutive chunks
+    """
+    it = iter(iterable)
+    chunk = list(islice(it, batch_size))
+    while chunk:
+        yield chunk
+        chunk = list(islice(it, batch_size))
+
+
+def embed_documents(
+        documents: List[str],
+        embedding_model: str,
+        batch_size: int = 100,
+        max_workers: int = 8,
+        cache: Optional[EmbeddingCache] = None
+) -> np.ndarray:
     """
     Generate embeddings for a list of documents.
 
+    Documents are sent to the embedding API in batches rather than one
+    request per document, with up to max_workers batches in flight at once.
+    Identical texts are embedded once, and texts found in cache are not
+    sent to the API at all.
+
     Args:
         documents: List of document texts
         embedding_model: Model name for embedding generation
+        batch_size: Number of documents per embedding request (API limit is 100)
+        max_workers: Maximum number of concurrent embedding requests
+        cache: Persistent embedding cache to read from and write back to (optional)
 
     Returns:
-        List of embedding vectors
+        float32 array of shape (len(documents), embedding_dimension), rows in document order
     """
-    embeddings = []
-
-    for i, doc in enumerate(documents, 1):
-        result = genai.embed_content(
-            model=embedding_model,
-            content=doc,
-            task_type="retrieval_document"
+    def embed_batch(batch: List[str]) -> List[List[float]]:
+        result = retry_with_backoff(
+            partial(genai.embed_content, model=embedding_model, content=batch, task_type="retrieval_document"),
+            _is_rate_limited,
+            description="Embedding batch"
         )
-        embeddings.append(result['embedding'])
+        return result['embedding']
+
+    cached = cache.get_many(embedding_model, documents) if cache is not None else {}
+    pending = list(dict.fromkeys(doc for doc in documents if doc not in cached))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        new_embeddings = _stack_embeddings(executor.map(embed_batch, chunks(pending, batch_size)), len(pending))
+
+    if cache is not None and pending:
+        cache.put_many(embedding_model, pending, new_embeddings)
+
+    if len(pending) == len(documents):
+        # Every document was unique and uncached: rows are already in document order
+        embeddings = new_embeddings
+    else:
+        by_text = {**cached, **dict(zip(pending, new_embeddings))}
+        embeddings = _stack_embeddings([[by_text[doc] for doc in documents]], len(documents))
+        print(f"Reused {len(documents) - len(pending)} cached or duplicate embeddings")
+
+    print(f"Successfully generated {len(embeddings)} embeddings")
+    return embeddings
+
+
+async def aembed_documents(
+        documents: List[str],
+        embedding_model: str,
+        batch_size: int = 100,
+        max_concurrency: int = 32
+) -> np.ndarray:
+    """
+    Generate embeddings for a list of documents from async code.
+
+    Uses the SDK's embed_content_async when available, otherwise runs the
+    blocking call in the event loop's default executor.
+
+    Args:
+        documents: List of document texts
+        embedding_model: Model name for embedding generation
+        batch_size: Number of documents per embedding request (API limit is 100)
+        max_concurrency: Maximum number of embedding requests in flight
+
+    Returns:
+        float32 array of shape (len(documents), embedding_dimension), rows in document order
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+    loop = asyncio.get_running_loop()
+
+    async def embed_batch(batch: List[str]) -> List[List[float]]:
+        async with semaphore:
+            if hasattr(genai, "embed_content_async"):
+                result = await genai.embed_content_async(
+                    model=embedding_model,
+                    content=batch,
+                    task_type="retrieval_document"
+                )
+            else:
+                result = await loop.run_in_executor(None, partial(
+                    genai.embed_content,
+                    model=embedding_model,
+                    content=batch,
+                    task_type="retrieval_document"
+                ))
+        return result['embedding']
+
+    batch_results = await asyncio.gather(*(embed_batch(batch) for batch in chunks(documents, batch_size)))
+    embeddings = _stack_embeddings(batch_results, len(documents))
 
     print(f"Successfully generated {len(embeddings)} embeddings")
     return embeddings
 
 
+def _stack_embeddings(batch_results: Iterable[List[List[float]]], num_documents: int) -> np.ndarray:
+    """Copy per-batch embedding lists, in order, into one preallocated float32 array."""
+    embeddings = np.empty((0, 0), dtype=np.float32)
+    offset = 0
+    for batch_embeddings in batch_results:
+        batch_array = np.asarray(batch_embeddings, dtype=np.float32)
+        if offset == 0:
+            # Dimension is known once the first batch arrives
+            embeddings = np.empty((num_documents, batch_array.shape[1]), dtype=np.float32)
+        embeddings[offset:offset + len(batch_array)] = batch_array
+        offset += len(batch_array)
+    return embeddings
+
+
 def embed_query(query: str, embedding_model: str) -> List[float]:
     """
     Generate embedding for a single query.
@@ -7,37 +7,86 @@ metadata extraction and section parsing.
 
 import os
 import re
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Any, Tuple
-
-from data_handling.document_parser import extract_section
+from typing import List, Dict, Any, Optional, Tuple
+
+from data_handling.document_parser import extract_section, locate_headers, lower_text, normalize_headers
+
+# Metadata labels: metadata key -> literal label preceding the value
+_METADATA_LABELS = {
+    'incident_id': 'Incident ID',
+    'date_of_detection': 'Date of Detection',
+    'vehicle_id': 'Vehicle ID',
+    'fleet': 'Fleet',
+    'threat_category': 'Threat Category',
+    'detection_method': 'Detection Method',
+    'severity': 'Severity',
+    'status': 'Status',
+}
+
+# All labels in one alternation, one named group per metadata key (dispatched via lastgroup)
+_METADATA_LABEL_RE = re.compile(
+    '|'.join(f'(?P<{key}>{re.escape(label)}:)' for key, label in _METADATA_LABELS.items()),
+    re.IGNORECASE
+)
+
+# Value patterns, matched directly after their label
+_METADATA_VALUE_PATTERNS = {
+    'incident_id': re.compile(r'\s*([A-Z0-9-]+)', re.IGNORECASE),
+    'date_of_detection': re.compile(
+        r'\s*((?P<year>[0-9]{4})-(?P<month>[0-9]{2})-[0-9]{2}(?:\s+[0-9]{2}:[0-9]{2})?(?:\s+UTC)?)', re.IGNORECASE
+    ),
+    'vehicle_id': re.compile(r'\s*([A-Z0-9/-]+)(?:\s*\(([^)]+)\))?', re.IGNORECASE),
+    'fleet': re.compile(r'\s*["\']([^"\']+)["\']'),
+    'threat_category': re.compile(r'\s*([^.\n]+?)(?=\s+Detection Method:|\s+Severity:|\n|$)', re.IGNORECASE),
+    'detection_method': re.compile(r'\s*([^.\n]+?)(?=\s+Severity:|\s+Status:|\n|\.)', re.IGNORECASE),
+    'severity': re.compile(r'\s*([^.\n]+)'),
+    'status': re.compile(r'\s*([^.\n]+)'),
+}
+
+# Free-text fields that get trailing punctuation stripped
+_CLEANED_FIELDS = {'threat_category', 'detection_method', 'severity', 'status'}
+
+# Minimum number of report files before parsing is spread across processes
+PARALLEL_PARSE_MIN_FILES = 64
 
 
 class IncidentReportParser:
     """Parses incident reports and extracts structured metadata and sections."""
 
-    # Section configuration for incident reports
+    # Section configuration for incident reports (headers lowercased once for case-insensitive search)
     SECTION_CONFIGS = {
         'description': {
-            'headers': ['Detailed Incident Description:', 'Incident Description:'],
-            'next_headers': ['Impact Assessment:', 'Response and Forensic Analysis:',
-                             'Response:', 'Lessons Learned:', 'Recommendations:']
+            'headers': normalize_headers(['Detailed Incident Description:', 'Incident Description:']),
+            'next_headers': normalize_headers(['Impact Assessment:', 'Response and Forensic Analysis:',
+                                               'Response:', 'Lessons Learned:', 'Recommendations:'])
         },
         'impact': {
-            'headers': ['Impact Assessment:', 'Impact:'],
-            'next_headers': ['Response and Forensic Analysis:', 'Response:',
-                             'Lessons Learned:', 'Recommendations:']
+            'headers': normalize_headers(['Impact Assessment:', 'Impact:']),
+            'next_headers': normalize_headers(['Response and Forensic Analysis:', 'Response:',
+                                               'Lessons Learned:', 'Recommendations:'])
         },
         'response': {
-            'headers': ['Response and Forensic Analysis:', 'Response:', 'Forensic Analysis:'],
-            'next_headers': ['Lessons Learned:', 'Recommendations:']
+            'headers': normalize_headers(['Response and Forensic Analysis:', 'Response:', 'Forensic Analysis:']),
+            'next_headers': normalize_headers(['Lessons Learned:', 'Recommendations:'])
         },
         'recommendations': {
-            'headers': ['Lessons Learned:', 'Recommendations:'],
-            'next_headers': []
+            'headers': normalize_headers(['Lessons Learned:', 'Recommendations:']),
+            'next_headers': ()
         }
     }
 
+    # Section configurations as a flat tuple, iterated once per report
+    _SECTION_ITEMS = tuple(SECTION_CONFIGS.items())
+
+    # Every header used by SECTION_CONFIGS, for a single-pass header scan
+    _ALL_HEADERS = tuple(dict.fromkeys(
+        header
+        for section in SECTION_CONFIGS.values()
+        for header in section['headers'] + section['next_headers']
+    ))
+
     def __init__(self, config):
         """
         Initialize the incident report parser.
@@ -68,83 +117,41 @@ class IncidentReportParser:
             'file_name': file_name
         }
 
-        # Extract Incident ID
-        incident_id_match = re.search(r'Incident ID:\s*([A-Z0-9-]+)', text, re.IGNORECASE)
-        if incident_id_match:
-            metadata['incident_id'] = incident_id_match.group(1).strip()
-
-        # Extract Date of Detection
-        date_match = re.search(
-            r'Date of Detection:\s*([0-9]{4}-[0-9]{2}-[0-9]{2}(?:\s+[0-9]{2}:[0-9]{2})?(?:\s+UTC)?)',
-            text, re.IGNORECASE
-        )
-        if date_match:
-            metadata['date_of_detection'] = date_match.group(1).strip()
-            year_match = re.search(r'([0-9]{4})', date_match.group(1))
-            month_match = re.search(r'[0-9]{4}-([0-9]{2})', date_match.group(1))
-            if year_match:
-                metadata['year'] = year_match.group(1)
-            if month_match:
-                metadata['month'] = month_match.group(1)
-
-        # Extract Vehicle ID
-        vehicle_id_match = re.search(r'Vehicle ID:\s*([A-Z0-9/-]+)(?:\s*\(([^)]+)\))?', text, re.IGNORECASE)
-        if vehicle_id_match:
-            metadata['vehicle_id'] = vehicle_id_match.group(1).strip()
-            if vehicle_id_match.group(2):
-                metadata['vehicle_id_note'] = vehicle_id_match.group(2).strip()
-
-        # Extract Fleet
-        fleet_match = re.search(r'Fleet:\s*["\']([^"\']+)["\']', text, re.IGNORECASE)
-        if fleet_match:
-            metadata['fleet'] = fleet_match.group(1).strip()
-
-        # Extract Threat Category
-        threat_match = re.search(
-            r'Threat Category:\s*([^.\n]+?)(?=\s+Detection Method:|\s+Severity:|\n|$)',
-            text, re.IGNORECASE
-        )
-        if threat_match:
-            metadata['threat_category'] = self._clean_value(threat_match.group(1))
-
-        # Extract Detection Method
-        detection_match = re.search(
-            r'Detection Method:\s*([^.\n]+?)(?=\s+Severity:|\s+Status:|\n|\.)',
-            text, re.IGNORECASE
-        )
-        if detection_match:
-            metadata['detection_method'] = self._clean_value(detection_match.group(1))
-
-        # Extract Severity
-        severity_match = re.search(r'Severity:\s*([^.\n]+)', text, re.IGNORECASE)
-        if severity_match:
-            metadata['severity'] = self._clean_value(severity_match.group(1))
-
-        # Extract Status
-        status_match = re.search(r'Status:\s*([^.\n]+)', text, re.IGNORECASE)
-        if status_match:
-            metadata['status'] = self._clean_value(status_match.group(1))
+        # Single scan for field labels; the first occurrence with a valid value wins
+        for label_match in _METADATA_LABEL_RE.finditer(text):
+            key = label_match.lastgroup
+            if key in metadata:
+                continue
+
+            value_match = _METADATA_VALUE_PATTERNS[key].match(text, label_match.end())
+            if not value_match:
+                continue
+
+            value = value_match.group(1).strip()
+            if key in _CLEANED_FIELDS:
+                value = self._clean_value(value)
+            metadata[key] = value
+
+            if key == 'date_of_detection':
+                metadata['year'] = value_match.group('year')
+                metadata['month'] = value_match.group('month')
+            elif key == 'vehicle_id' and value_match.group(2):
+                metadata['vehicle_id_note'] = value_match.group(2).strip()
 
         return metadata
 
-    def parse_incident_report(
-            self,
-            file_path: str
-    ) -> List[Tuple[str, Dict[str, Any], str]]:
+    def split_report(self, full_text: str, file_name: str) -> List[Tuple[str, Dict[str, Any], str]]:
         """
-        Parse incident report and extract individual sections with cross-section metadata.
+        Split incident report text into sections with metadata, without token counting.
 
         Args:
-            file_path: Path to the incident report text file
+            full_text: Full incident report text
+            file_name: Name of the report file
 
         Returns:
             List of tuples (text, metadata, document_id) for each section
         """
-        with open(file_path, 'r', encoding='utf-8') as f:
-            full_text = f.read()
-
         # Extract base metadata
-        file_name = os.path.basename(file_path)
         base_metadata = self.extract_metadata(full_text, file_name)
 
         # Prepare results list
@@ -153,68 +160,146 @@ class IncidentReportParser:
 
         # First pass: Extract all section texts
         extracted_sections = {}
-        for section_key, config in self.SECTION_CONFIGS.items():
+        full_text_lower = lower_text(full_text)
+        header_positions = locate_headers(full_text_lower, self._ALL_HEADERS)
+        for section_key, config in self._SECTION_ITEMS:
             section_text = extract_section(
                 full_text,
                 config['headers'],
-                config['next_headers']
+                config['next_headers'],
+                text_lower=full_text_lower,
+                header_positions=header_positions
             )
             if section_text:
                 extracted_sections[section_key] = section_text
 
-        # Second pass: Build results with cross-section metadata
+        # Second pass: Build results with cross-section references.
+        # Sibling sections are referenced by ID ("<report_id>_<section>") rather than
+        # copying every section's text into every section's metadata.
+        available_sections = list(extracted_sections)
         for section_key, section_text in extracted_sections.items():
             section_metadata = base_metadata.copy()
             section_metadata['section_type'] = section_key
-            section_metadata['token_count'] = self.config.count_tokens(section_text)
-
-            # Add ALL sections' text to metadata (including the current section)
-            for other_section_key, other_section_text in extracted_sections.items():
-                section_metadata[f'section_{other_section_key}_text'] = other_section_text
+            section_metadata['report_id'] = incident_id
+            section_metadata['sections'] = available_sections
 
             doc_id = f"{incident_id}_{section_key}"
             results.append((section_text, section_metadata, doc_id))
 
         return results
 
+    def parse_incident_report(
+            self,
+            file_path: str,
+            text: Optional[str] = None
+    ) -> List[Tuple[str, Dict[str, Any], str]]:
+        """
+        Parse incident report and extract individual sections with cross-section references.
+
+        Args:
+            file_path: Path to the incident report text file
+            text: Already-loaded report contents (optional, skips reading file_path)
+
+        Returns:
+            List of tuples (text, metadata, document_id) for each section
+        """
+        if text is None:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                text = f.read()
+
+        sections = self.split_report(text, os.path.basename(file_path))
+        self._add_token_counts(sections)
+        return sections
+
+    def _add_token_counts(self, sections: List[Tuple[str, Dict[str, Any], str]]):
+        """Add a token_count field to each section's metadata."""
+        for section_text, section_metadata, _ in sections:
+            section_metadata['token_count'] = self.config.count_tokens(section_text)
+
+    @staticmethod
+    def _list_files(directory_path: str, file_pattern: str) -> List[Path]:
+        """
+        List files in a directory matching a glob pattern, sorted by path.
+
+        Simple suffix patterns such as "*.txt" use a single os.scandir pass;
+        anything else (further wildcards, or a path separator reaching into
+        subdirectories) falls back to Path.glob. Either way a missing directory
+        yields no files rather than an error.
+        """
+        suffix = file_pattern[1:]
+        if file_pattern.startswith('*') and not any(c in suffix for c in ('*', '?', '[', '/', os.sep)):
+            try:
+                with os.scandir(directory_path) as entries:
+                    return sorted(Path(entry.path) for entry in entries
+                                  if entry.name.endswith(suffix) and entry.is_file())
+            except (FileNotFoundError, NotADirectoryError):
+                return []
+        return sorted(Path(directory_path).glob(file_pattern))
+
     def load_incident_reports(
             self,
             directory_path: str,
-            file_pattern: str = "*.txt"
+            file_pattern: str = "*.txt",
+            max_workers: Optional[int] = None
     ) -> Tuple[List[str], List[Dict[str, Any]], List[str]]:
         """
         Load incident reports from a directory and extract all sections.
 
+        Large directories are parsed in parallel across processes; token counts
+        are added in this process so the RAG configuration never has to be pickled.
+
         Args:
             directory_path: Path to directory containing incident reports
             file_pattern: Glob pattern for files to load (default: "*.txt")
+            max_workers: Number of parser processes (default: CPU count; 1 disables the pool)
 
         Returns:
             Tuple of (documents, metadatas, ids) for all sections across all reports
         """
-        dir_path = Path(directory_path)
-        files = sorted(dir_path.glob(file_pattern))
+        files = self._list_files(directory_path, file_pattern)
 
         all_documents = []
         all_metadatas = []
         all_ids = []
 
-        for i, file_path in enumerate(files, 1):
-            print(f"[{i}/{len(files)}] Processing: {file_path.name}")
+        # Process start-up costs more than it saves on small directories
+        if max_workers != 1 and len(files) >= PARALLEL_PARSE_MIN_FILES:
+            executor = ProcessPoolExecutor(max_workers=max_workers)
+            parsed = executor.map(_split_report_file, files, chunksize=8)
+        else:
+            executor = None
+            parsed = map(_split_report_file, files)
+
+        try:
+            for i, (file_path, sections) in enumerate(zip(files, parsed), 1):
+                print(f"[{i}/{len(files)}] Processing: {file_path.name}")
+                self._add_token_counts(sections)
+
+                # Add all sections
+                for text, metadata, doc_id in sections:
+                    all_documents.append(text)
+                    all_metadatas.append(metadata)
+                    all_ids.append(doc_id)
+
+                    section_type = metadata.get('section_type', 'unknown')
+                    tokens = metadata.get('token_count', 0)
+                    print(f"  ✓ {section_type}: {tokens} tokens (ID: {doc_id})")
+
+                print(f"  → Generated {len(sections)} documents from this report\n")
+        finally:
+            if executor is not None:
+                executor.shutdown()
 
-            # Parse report and extract all sections
-            sections = self.parse_incident_report(str(file_path))
+        return all_documents, all_metadatas, all_ids
 
-            # Add all sections
-            for text, metadata, doc_id in sections:
-                all_documents.append(text)
-                all_metadatas.append(metadata)
-                all_ids.append(doc_id)
 
-                section_type = metadata.get('section_type', 'unknown')
-                tokens = metadata.get('token_count', 0)
-                print(f"  ✓ {section_type}: {tokens} tokens (ID: {doc_id})")
+# Shared parser for _split_report_file; split_report keeps no per-call state
+_SPLIT_PARSER = IncidentReportParser(config=None)
 
-            print(f"  → Generated {len(sections)} documents from this report\n")
 
-        return all_documents, all_metadatas, all_ids
\ No newline at end of file
+def _split_report_file(file_path: Path) -> List[Tuple[str, Dict[str, Any], str]]:
+    """Read and split one report file; module-level so it can run in a worker process."""
+    return _SPLIT_PARSER.split_report(
+        file_path.read_text(encoding='utf-8'),
+        file_path.name
+    )
\ No newline at end of file
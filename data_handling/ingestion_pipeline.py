@@ -8,7 +8,6 @@ parsing to embedding to vector database storage.
 import os
 from configs.config import RAGConfig
 from data_handling.incident_parser import IncidentReportParser
-from data_handling.vector_store import VectorStore
 
 
 class IngestionPipeline:
@@ -23,12 +22,13 @@ class IngestionPipeline:
         """
         self.config = config
         self.parser = IncidentReportParser(config)
-        self.vector_store = VectorStore(config.index, config.embedding_model)
+        self.vector_store = config.vector_store
 
     def ingest_incident_reports(
             self,
             directory_path: str,
             file_pattern: str = "*.txt",
+            force: bool = False
     ):
         """
         Complete pipeline to ingest incident reports from a directory.
@@ -37,6 +37,8 @@ class IngestionPipeline:
             directory_path: Path to directory containing incident reports
             file_pattern: Glob pattern for files to load (default: "*.txt")
             use_namespaces: Whether to organize by namespace (default: True)
+            force: Upload every section without first fetching stored vectors to skip unchanged
+                ones (use for a fresh or emptied index, where nothing can be skipped)
 
         Returns:
             Dictionary with upload statistics
@@ -47,10 +49,13 @@ class IngestionPipeline:
             file_pattern=file_pattern
         )
 
+        # The freshly parsed metadata dicts are not reused, so upload fields are written in place
         results = self.vector_store.upsert_by_namespace(
             documents=documents,
             metadatas=metadatas,
-            ids=ids
+            ids=ids,
+            force=force,
+            copy_metadata=False
         )
 
         return results
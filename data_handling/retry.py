@@ -0,0 +1,76 @@
+"""
+Retry Module
+
+Shared retry loop with jittered exponential backoff for transient API errors
+(Gemini and Pinecone rate limits and server-side failures).
+"""
+
+import random
+import time
+from typing import Callable, TypeVar
+
+T = TypeVar('T')
+
+# Default backoff for transient API errors (seconds)
+RETRY_INITIAL_DELAY = 0.5
+RETRY_MAX_DELAY = 10.0
+RETRY_MAX_RETRIES = 5
+
+
+def _retry_after(error: Exception):
+    """Server-requested wait from a Retry-After header on the error, or None."""
+    retry_after = (getattr(error, 'headers', None) or {}).get('Retry-After')
+    try:
+        return float(retry_after)
+    except (TypeError, ValueError):
+        return None
+
+
+def _error_reason(error: Exception) -> str:
+    """Short description of an error for retry messages (HTTP status if available)."""
+    for attribute in ('status', 'code'):
+        value = getattr(error, attribute, None)
+        if isinstance(value, int):
+            return str(value)
+    return error.__class__.__name__
+
+
+def retry_with_backoff(
+        fn: Callable[[], T],
+        is_retryable: Callable[[Exception], bool],
+        description: str = "Request",
+        initial_delay: float = RETRY_INITIAL_DELAY,
+        max_delay: float = RETRY_MAX_DELAY,
+        max_retries: int = RETRY_MAX_RETRIES
+) -> T:
+    """
+    Call fn, retrying errors accepted by is_retryable with jittered exponential backoff.
+
+    A Retry-After header on the error takes precedence over the computed delay
+    (capped at max_delay). Other errors, and the error of the last attempt, are raised.
+
+    Args:
+        fn: Zero-argument callable making the request
+        is_retryable: Whether an error is transient (e.g. HTTP 429 or 5xx)
+        description: What is being retried, used in the printed retry message
+        initial_delay: Delay before the first retry, doubled after each retry
+        max_delay: Upper bound on any single delay
+        max_retries: Number of retries after the first attempt
+
+    Returns:
+        Result of the first successful call to fn
+    """
+    delay = initial_delay
+    for attempt in range(max_retries + 1):
+        try:
+            return fn()
+        except Exception as e:
+            if not is_retryable(e) or attempt == max_retries:
+                raise
+            wait = _retry_after(e)
+            if wait is None:
+                wait = delay + random.uniform(0, delay)
+            wait = min(wait, max_delay)
+            print(f"{description} failed ({_error_reason(e)}), retrying in {wait:.1f}s")
+            time.sleep(wait)
+            delay = min(delay * 2, max_delay)
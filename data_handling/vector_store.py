@@ -5,101 +5,367 @@ Handles all Pinecone vector database operations including
 document upsert, namespace management, and similarity search.
 """
 
+import json
 import time
 import uuid
-from typing import List, Dict, Any
+from collections import defaultdict, deque
+from hashlib import blake2b
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
+import numpy as np
+
+from data_handling.embedding_cache import EmbeddingCache
 from data_handling.embeddings import embed_documents
+from data_handling.retry import retry_with_backoff
+
+# Pinecone rejects upsert requests larger than 2 MB; keep some headroom
+MAX_UPSERT_BYTES = int(1.8 * 1024 * 1024)
+
+# Decimal places kept when sending float32 embeddings (about float32 precision); without
+# rounding, float32 -> float conversion prints ~17 digits per value and inflates request JSON
+UPSERT_VALUE_DECIMALS = 8
+
+# Maximum number of async upserts in flight (matches RAGConfig's index pool_threads); older
+# batches are awaited before more are submitted, so memory stays bounded by batch size
+MAX_PENDING_UPSERTS = 30
+
+# Number of IDs per fetch request when checking for unchanged vectors
+FETCH_BATCH_SIZE = 100
+
+# How long to poll index stats for freshly upserted vectors to become visible, and the
+# first and longest wait between polls (seconds)
+STATS_POLL_TIMEOUT = 5.0
+STATS_POLL_INITIAL_DELAY = 0.1
+STATS_POLL_MAX_DELAY = 2.0
+# Key under which describe_index_stats() may list the default ('') namespace
+DEFAULT_NAMESPACE_NAME = '__default__'
+
+
+# Incremented after every upsert that wrote vectors, so results cached from earlier queries can be told apart
+_UPSERT_GENERATION = 0
+
+# gRPC status codes equivalent to HTTP 429 / 5xx, for the gRPC index client
+_RETRYABLE_GRPC_CODES = frozenset(['RESOURCE_EXHAUSTED', 'UNAVAILABLE', 'INTERNAL', 'DEADLINE_EXCEEDED'])
+
+
+def _is_retryable(error: Exception) -> bool:
+    """Whether a Pinecone API error is an HTTP 429 rate-limit or 5xx server response (or gRPC equivalent)."""
+    status = getattr(error, 'status', None)
+    if isinstance(status, int):
+        return status == 429 or status >= 500
+    code = getattr(error, 'code', None)
+    if callable(code):
+        return getattr(code(), 'name', None) in _RETRYABLE_GRPC_CODES
+    return False
+
+
+def _wait_for_result(async_result):
+    """Block on an async_req upsert: REST clients return an ApplyResult, gRPC clients a future."""
+    if hasattr(async_result, 'get'):
+        return async_result.get()
+    return async_result.result()
+
+
+def _content_hash(embedding_model: str, doc_text: str, metadata: Dict[str, Any]) -> str:
+    """
+    Hash a document's text and metadata, to detect whether a stored vector is stale.
+
+    The embedding model is part of the hash, so switching models (even to one with the
+    same dimension) re-embeds every document instead of keeping the old model's vectors.
+    """
+    payload = embedding_model + "\0" + json.dumps(metadata, sort_keys=True, default=str) + "\0" + doc_text
+    return blake2b(payload.encode('utf-8'), digest_size=8).hexdigest()
+
+
+def _build_vector(
+        doc_id: str,
+        embedding: List[float],
+        doc_text: str,
+        metadata: Dict[str, Any],
+        content_hash: str,
+        copy_metadata: bool = True
+) -> Tuple[str, List[float], Dict[str, Any]]:
+    """
+    Build a Pinecone (id, values, metadata) record, adding the document text and content hash to its metadata.
+
+    With copy_metadata=False the fields are written into metadata in place instead of a copy.
+    """
+    if copy_metadata:
+        metadata = metadata.copy()
+    metadata['text'] = doc_text
+    metadata['length'] = len(doc_text)
+    metadata['content_hash'] = content_hash
+    return doc_id, embedding, metadata
+
+
+def upsert_generation() -> int:
+    """Counter of upserts that wrote vectors in this process; changes whenever an index may hold new data."""
+    return _UPSERT_GENERATION
+
+
+def _vector_values(embeddings: np.ndarray) -> List[List[float]]:
+    """Embedding rows as Python float lists, rounded so they serialize as compactly as float32 allows."""
+    return np.round(embeddings.astype(np.float64), UPSERT_VALUE_DECIMALS).tolist()
+
+
+def _vector_batches(
+        ids: List[str],
+        embeddings: np.ndarray,
+        documents: List[str],
+        metadatas: List[Dict[str, Any]],
+        content_hashes: List[str],
+        batch_size: int,
+        copy_metadata: bool = True
+) -> Iterator[List[Tuple[str, List[float], Dict[str, Any]]]]:
+    """Yield Pinecone vector records in batches, building each batch only when requested."""
+    for start in range(0, len(documents), batch_size):
+        end = start + batch_size
+        # Inputs stay as parallel lists and a float32 array; records are only built per batch,
+        # as (id, values, metadata) tuples rather than one dict per vector
+        yield [
+            _build_vector(doc_id, values, doc_text, metadata, content_hash, copy_metadata)
+            for doc_id, values, doc_text, metadata, content_hash in zip(
+                ids[start:end], _vector_values(embeddings[start:end]), documents[start:end],
+                metadatas[start:end], content_hashes[start:end]
+            )
+        ]
 
 
 class VectorStore:
     """Manages vector database operations for the Incident Copilot system."""
 
-    def __init__(self, index, embedding_model: str):
+    def __init__(
+            self,
+            index,
+            embedding_model: str,
+            embedding_max_workers: int = 8,
+            embedding_cache: Optional[EmbeddingCache] = None
+    ):
         """
         Initialize the vector store.
 
         Args:
             index: index instance
             embedding_model: Model name for embedding generation
+            embedding_max_workers: Maximum number of concurrent embedding requests
+            embedding_cache: Persistent embedding cache to skip re-embedding unchanged texts (optional)
         """
         self.index = index
         self.embedding_model = embedding_model
+        self.embedding_max_workers = embedding_max_workers
+        self.embedding_cache = embedding_cache
 
     def upsert_vectors(
             self,
             documents: List[str],
             metadatas: List[Dict[str, Any]] = None,
             ids: List[str] = None,
-            batch_size: int = 100,
-            namespace: str = ""
+            batch_size: int = 500,
+            namespace: str = "",
+            force: bool = False,
+            copy_metadata: bool = True
     ) -> Dict[str, Any]:
         """
         Add documents to the Pinecone vector database.
 
+        Documents whose stored vector already has the same content hash are
+        skipped, so re-ingesting unchanged reports neither embeds nor uploads them.
+
         Args:
             documents: List of document texts
             metadatas: List of metadata dictionaries (optional)
             ids: List of document IDs (optional, will auto-generate if not provided)
-            batch_size: Number of vectors to upload per batch
+            batch_size: Number of vectors to upload per batch (clamped to fit the upsert size limit)
             namespace: Pinecone namespace to store vectors (optional, defaults to empty string)
+            force: Upload everything without checking for unchanged vectors (e.g. for a fresh index)
+            copy_metadata: Copy each metadata dict before adding text/length/content_hash; pass False
+                to write them in place when the caller does not reuse its metadata dicts
 
         Returns:
             Dictionary with upload statistics
         """
-        # Auto-generate IDs if not provided
+        global _UPSERT_GENERATION
+
+        # Auto-generate IDs if not provided (fresh IDs can't match anything stored)
         if ids is None:
-            ids = [str(uuid.uuid4()) for _ in documents]
+            ids = [uuid.uuid4().hex for _ in range(len(documents))]
             print(f"Generated {len(ids)} unique document IDs")
+            force = True
 
         # Create empty metadata if not provided
         if metadatas is None:
             metadatas = [{} for _ in documents]
 
-        # Generate embeddings
-        embeddings = embed_documents(documents, self.embedding_model)
+        # Duplicate IDs overwrite each other, so only distinct IDs can show up in the stats
+        requested_ids = len(set(ids))
 
-        # Prepare vectors for Pinecone
-        vectors = []
-        for doc_id, embedding, doc_text, metadata in zip(ids, embeddings, documents, metadatas):
-            # Add the document text to metadata so we can retrieve it later
-            metadata_with_text = metadata.copy()
-            metadata_with_text['text'] = doc_text
-            metadata_with_text['length'] = len(doc_text)
+        # Upsert in ID order so related IDs (e.g. "<incident>_<section>") are written together
+        order = sorted(range(len(ids)), key=ids.__getitem__)
+        ids = [ids[i] for i in order]
+        documents = [documents[i] for i in order]
+        metadatas = [metadatas[i] for i in order]
+        content_hashes = [
+            _content_hash(self.embedding_model, doc, metadata) for doc, metadata in zip(documents, metadatas)
+        ]
 
-            vectors.append({
-                'id': doc_id,
-                'values': embedding,
-                'metadata': metadata_with_text
-            })
+        # Drop documents whose stored vector is already up to date
+        skipped_count = 0
+        if not force:
+            changed = self._changed_indices(ids, content_hashes, namespace)
+            skipped_count = len(ids) - len(changed)
+            if skipped_count:
+                ids = [ids[i] for i in changed]
+                documents = [documents[i] for i in changed]
+                metadatas = [metadatas[i] for i in changed]
+                content_hashes = [content_hashes[i] for i in changed]
+                print(f"  Skipping {skipped_count} unchanged vectors")
 
-        # Upsert to Pinecone in batches
+        # Embed one batch at a time and hand each batch to the index's thread pool as soon
+        # as its embeddings arrive, so upserts run while the next batch is being embedded.
+        # Vector records are built batch by batch, and at most MAX_PENDING_UPSERTS batches are
+        # in flight: the oldest is awaited (and released) before another is submitted.
+        pending = deque()
         uploaded_count = 0
-        for i in range(0, len(vectors), batch_size):
-            batch = vectors[i:i + batch_size]
-            self.index.upsert(vectors=batch, namespace=namespace)
+        finished_batches = 0
+        namespace_info = f" to namespace '{namespace}'" if namespace else ""
+
+        def finish_oldest_upsert():
+            nonlocal uploaded_count, finished_batches
+            batch, async_result = pending.popleft()
+            self._wait_for_upsert(batch, async_result, namespace)
             uploaded_count += len(batch)
-            namespace_info = f" to namespace '{namespace}'" if namespace else ""
-            print(f"  Uploaded batch {i // batch_size + 1}: {uploaded_count}/{len(vectors)} vectors{namespace_info}")
-            time.sleep(0.1)  # Small delay to avoid rate limiting
+            finished_batches += 1
+            print(f"  Uploaded batch {finished_batches}: {uploaded_count}/{len(documents)} vectors{namespace_info}")
+
+        upsert_batch_size = None
+        submitted = False
+        try:
+            for start in range(0, len(documents), batch_size):
+                end = start + batch_size
+                embeddings = embed_documents(
+                    documents[start:end],
+                    self.embedding_model,
+                    max_workers=self.embedding_max_workers,
+                    cache=self.embedding_cache
+                )
+
+                # Clamp batch size so a batch stays under the request size limit, estimated from the first vector
+                if upsert_batch_size is None:
+                    first_vector = _build_vector(
+                        ids[0], _vector_values(embeddings[:1])[0], documents[0], metadatas[0], content_hashes[0],
+                        copy_metadata
+                    )
+                    bytes_per_vector = len(json.dumps(first_vector))
+                    upsert_batch_size = max(1, min(batch_size, MAX_UPSERT_BYTES // bytes_per_vector))
 
-        # Get index statistics
-        time.sleep(1)  # Wait for index to update
-        stats = self.index.describe_index_stats()
+                for batch in _vector_batches(
+                        ids[start:end], embeddings, documents[start:end],
+                        metadatas[start:end], content_hashes[start:end], upsert_batch_size, copy_metadata
+                ):
+                    if len(pending) >= MAX_PENDING_UPSERTS:
+                        finish_oldest_upsert()
+                    pending.append((batch, self.index.upsert(vectors=batch, namespace=namespace, async_req=True)))
+                    submitted = True
+
+            while pending:
+                finish_oldest_upsert()
+        finally:
+            # Even a partly failed upsert may have changed the index
+            if submitted:
+                _UPSERT_GENERATION += 1
+
+        # Get index statistics once every ID from this call is visible in the namespace
+        stats = self._wait_for_index_stats(namespace, requested_ids)
 
         return {
             "uploaded": uploaded_count,
+            "skipped_unchanged": skipped_count,
             "total_in_index": stats.total_vector_count,
             "dimension": stats.dimension,
             "index_stats": stats
         }
 
+    def _wait_for_upsert(self, batch: List[Tuple[str, List[float], Dict[str, Any]]], async_result, namespace: str):
+        """
+        Wait for an async upsert, resubmitting with backoff if it was rate limited or failed server-side.
+
+        Args:
+            batch: Vector records of the upsert
+            async_result: Pending result returned by index.upsert(async_req=True)
+            namespace: Pinecone namespace of the upsert
+        """
+        # The first attempt waits on the already-submitted upsert; retries resubmit the batch
+        submitted = iter([async_result])
+
+        def upsert_batch():
+            result = next(submitted, None) or self.index.upsert(vectors=batch, namespace=namespace, async_req=True)
+            return _wait_for_result(result)
+
+        return retry_with_backoff(upsert_batch, _is_retryable, description="  Upsert batch")
+
+    def _wait_for_index_stats(self, namespace: str, expected_count: int):
+        """
+        Fetch index statistics, polling briefly until the namespace holds at least expected_count vectors.
+
+        Pinecone makes upserted vectors visible to stats eventually; on the happy
+        path the first call already reflects the upload and nothing sleeps.
+
+        Args:
+            namespace: Pinecone namespace that was written to
+            expected_count: Minimum vector count the namespace must report
+
+        Returns:
+            Index statistics from describe_index_stats()
+        """
+        delay = STATS_POLL_INITIAL_DELAY
+        deadline = time.monotonic() + STATS_POLL_TIMEOUT
+        while True:
+            stats = self.index.describe_index_stats()
+            namespaces = getattr(stats, 'namespaces', None)
+            if namespaces is None:
+                # No per-namespace counts to wait on
+                return stats
+            namespace_stats = namespaces.get(namespace)
+            if namespace_stats is None and not namespace:
+                # The default namespace may be reported under this name instead of ''
+                namespace_stats = namespaces.get(DEFAULT_NAMESPACE_NAME)
+            vector_count = getattr(namespace_stats, 'vector_count', 0)
+            if vector_count >= expected_count or time.monotonic() + delay > deadline:
+                return stats
+            time.sleep(delay)
+            delay = min(delay * 2, STATS_POLL_MAX_DELAY)
+
+    def _changed_indices(self, ids: List[str], content_hashes: List[str], namespace: str) -> List[int]:
+        """
+        Find which documents differ from what is stored in the index.
+
+        Args:
+            ids: Document IDs
+            content_hashes: Content hash of each document
+            namespace: Pinecone namespace to check
+
+        Returns:
+            Indices of documents that are new or whose content hash changed
+        """
+        changed = []
+        for start in range(0, len(ids), FETCH_BATCH_SIZE):
+            batch_ids = ids[start:start + FETCH_BATCH_SIZE]
+            existing = self.index.fetch(ids=batch_ids, namespace=namespace).vectors
+            for offset, doc_id in enumerate(batch_ids):
+                record = existing.get(doc_id)
+                stored_hash = record.metadata.get('content_hash') if record and record.metadata else None
+                if stored_hash != content_hashes[start + offset]:
+                    changed.append(start + offset)
+        return changed
+
     def upsert_by_namespace(
             self,
             documents: List[str],
             metadatas: List[Dict[str, Any]],
             ids: List[str],
-            batch_size: int = 100
+            batch_size: int = 500,
+            force: bool = False,
+            copy_metadata: bool = True
     ) -> Dict[str, Any]:
         """
         Add documents to Pinecone, automatically organizing them by namespace based on section_type.
@@ -110,19 +376,19 @@ class VectorStore:
             metadatas: List of metadata dictionaries (must contain 'section_type')
             ids: List of document IDs
             batch_size: Number of vectors to upload per batch
+            force: Upload everything without checking for unchanged vectors
+            copy_metadata: Copy metadata dicts before adding upload fields (False writes them in place)
 
         Returns:
             Dictionary with upload statistics per namespace
         """
         # Group documents by section_type
-        namespace_groups = {}
+        namespace_groups = defaultdict(lambda: {'docs': [], 'metas': [], 'ids': []})
         for doc, metadata, doc_id in zip(documents, metadatas, ids):
-            section_type = metadata.get('section_type', 'default')
-            if section_type not in namespace_groups:
-                namespace_groups[section_type] = {'docs': [], 'metas': [], 'ids': []}
-            namespace_groups[section_type]['docs'].append(doc)
-            namespace_groups[section_type]['metas'].append(metadata)
-            namespace_groups[section_type]['ids'].append(doc_id)
+            group = namespace_groups[metadata.get('section_type', 'default')]
+            group['docs'].append(doc)
+            group['metas'].append(metadata)
+            group['ids'].append(doc_id)
 
         # Upload each namespace group
         results = {}
@@ -142,7 +408,9 @@ class VectorStore:
                 metadatas=group_data['metas'],
                 ids=group_data['ids'],
                 batch_size=batch_size,
-                namespace=namespace
+                namespace=namespace,
+                force=force,
+                copy_metadata=copy_metadata
             )
 
             results[namespace] = result
@@ -163,6 +431,31 @@ class VectorStore:
             'namespaces': results
         }
 
+    def fetch_section_texts(self, report_ids: List[str], section_type: str) -> Dict[str, str]:
+        """
+        Fetch the text of one section for several incident reports.
+
+        Section vectors are stored with ID "<report_id>_<section_type>" in the
+        namespace named after the section type.
+
+        Args:
+            report_ids: Report IDs (the 'report_id' metadata field of any section)
+            section_type: Section to fetch (e.g. 'recommendations')
+
+        Returns:
+            Dictionary mapping report ID to section text (reports without that section are omitted)
+        """
+        if not report_ids:
+            return {}
+
+        vector_ids = [f"{report_id}_{section_type}" for report_id in report_ids]
+        vectors = self.index.fetch(ids=vector_ids, namespace=section_type).vectors
+        return {
+            report_id: vectors[vector_id].metadata.get('text', '')
+            for report_id, vector_id in zip(report_ids, vector_ids)
+            if vector_id in vectors
+        }
+
     def query(
             self,
             query_vector: List[float],
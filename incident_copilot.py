@@ -13,14 +13,16 @@ Workflow:
 
 **If CRITICAL INFO PRESENT (Full Path):**
    4b. Summarization Agent - Executive summary of the complete incident
-   5b. Retriever - Searches Pinecone for similar incidents and recommendations
+   5b. Retriever - Searches Pinecone for similar incidents and recommendations (runs in parallel with 4b)
    6b. Mitigation Agent - Comprehensive mitigation plan using summary + historical context
 
 Each agent has its own system message defining its role and behavior.
 All agents use system/human message separation for proper role definition.
 """
 
-from typing import TypedDict, List, Dict, Any
+import asyncio
+from functools import cached_property
+from typing import Annotated, TypedDict, List, Dict, Any, Union
 
 from langgraph.graph import StateGraph, END
 
@@ -36,6 +38,15 @@ from nodes import (
 )
 
 
+def _merge_errors(current: str, update: str) -> str:
+    """Combine error messages, so parallel branches that both fail keep both messages."""
+    if not current or current == update:
+        return update
+    if not update:
+        return current
+    return f"{current}; {update}"
+
+
 # Define the state schema for the copilot workflow
 class CopilotState(TypedDict):
     """State schema for the incident copilot workflow."""
@@ -66,8 +77,8 @@ class CopilotState(TypedDict):
     final_response: str
     metadata: Dict[str, Any]
 
-    # Error handling
-    error: str
+    # Error handling (summarize and retrieve run in parallel and may both report one)
+    error: Annotated[str, _merge_errors]
 
 
 class IncidentCopilot:
@@ -85,39 +96,69 @@ class IncidentCopilot:
         """
         self.config = config
 
-        # Initialize node instances
-        self._init_nodes()
-
-        # Build workflow graph
+        # Build workflow graph (node instances are created lazily, on first use)
         self.graph = self._build_graph()
         print("Incident Copilot initialized with modular nodes!")
 
-    def _init_nodes(self):
-        """Initialize all node instances."""
-        self.validation_node = ValidationNode(self.config)
-        self.router_node = RouterNode(self.config)
-        self.conservative_summary_node = ConservativeSummaryNode(self.config)
-        self.conservative_nextsteps_node = ConservativeNextStepsNode(self.config)
-        self.summarization_node = CompleteSummarizationNode(self.config)
-        self.retriever_node = RetrieverNode(self.config)
-        self.mitigation_node = CompleteMitigationNode(self.config)
+    # Node instances, created the first time the workflow reaches them, so paths that
+    # are never taken (e.g. retrieval on the conservative path) cost nothing to set up
+    @cached_property
+    def validation_node(self) -> ValidationNode:
+        """Validation node, created on first use."""
+        return ValidationNode(self.config)
+
+    @cached_property
+    def router_node(self) -> RouterNode:
+        """Router node, created on first use."""
+        return RouterNode(self.config)
+
+    @cached_property
+    def conservative_summary_node(self) -> ConservativeSummaryNode:
+        """Conservative summary node, created on first use."""
+        return ConservativeSummaryNode(self.config)
+
+    @cached_property
+    def conservative_nextsteps_node(self) -> ConservativeNextStepsNode:
+        """Conservative next steps node, created on first use."""
+        return ConservativeNextStepsNode(self.config)
+
+    @cached_property
+    def summarization_node(self) -> CompleteSummarizationNode:
+        """Complete summarization node, created on first use."""
+        return CompleteSummarizationNode(self.config)
+
+    @cached_property
+    def retriever_node(self) -> RetrieverNode:
+        """Retriever node (connects to the Pinecone index), created on first use."""
+        return RetrieverNode(self.config)
+
+    @cached_property
+    def mitigation_node(self) -> CompleteMitigationNode:
+        """Complete mitigation node, created on first use."""
+        return CompleteMitigationNode(self.config)
+
+    def _lazy_node(self, attribute: str):
+        """Wrap a node attribute so the node is only instantiated when the graph first runs it."""
+        def run_node(state: CopilotState) -> CopilotState:
+            return getattr(self, attribute)(state)
+        return run_node
 
     def _build_graph(self) -> StateGraph:
         """Build the LangGraph workflow with conditional routing based on critical info."""
         workflow = StateGraph(CopilotState)
 
         # Add nodes using the modular node instances
-        workflow.add_node("validate", self.validation_node)
-        workflow.add_node("router", self.router_node)
+        workflow.add_node("validate", self._lazy_node("validation_node"))
+        workflow.add_node("router", self._lazy_node("router_node"))
 
         # Conservative path (critical info missing)
-        workflow.add_node("conservative_summary", self.conservative_summary_node)
-        workflow.add_node("conservative_nextsteps", self.conservative_nextsteps_node)
+        workflow.add_node("conservative_summary", self._lazy_node("conservative_summary_node"))
+        workflow.add_node("conservative_nextsteps", self._lazy_node("conservative_nextsteps_node"))
 
         # Full path (critical info present)
-        workflow.add_node("summarize", self.summarization_node)
-        workflow.add_node("retrieve", self.retriever_node)
-        workflow.add_node("mitigate", self.mitigation_node)
+        workflow.add_node("summarize", self._lazy_node("summarization_node"))
+        workflow.add_node("retrieve", self._lazy_node("retriever_node"))
+        workflow.add_node("mitigate", self._lazy_node("mitigation_node"))
 
         # Set entry point
         workflow.set_entry_point("validate")
@@ -131,7 +172,8 @@ class IncidentCopilot:
             self._route_by_critical_info,
             {
                 "conservative": "conservative_summary",
-                "full": "summarize"
+                "summarize": "summarize",
+                "retrieve": "retrieve"
             }
         )
 
@@ -139,14 +181,13 @@ class IncidentCopilot:
         workflow.add_edge("conservative_summary", "conservative_nextsteps")
         workflow.add_edge("conservative_nextsteps", END)
 
-        # Full path: summarize → retrieve → mitigate → END
-        workflow.add_edge("summarize", "retrieve")
-        workflow.add_edge("retrieve", "mitigate")
+        # Full path: summarize and retrieve run in parallel, then mitigate (waits for both) → END
+        workflow.add_edge(["summarize", "retrieve"], "mitigate")
         workflow.add_edge("mitigate", END)
 
         return workflow.compile()
 
-    def _route_by_critical_info(self, state: CopilotState) -> str:
+    def _route_by_critical_info(self, state: CopilotState) -> Union[str, List[str]]:
         """
         Routing function that decides path based on critical_info_missing flag.
 
@@ -154,12 +195,13 @@ class IncidentCopilot:
             state: Current workflow state
 
         Returns:
-            "conservative" if critical info missing, "full" otherwise
+            "conservative" if critical info missing, otherwise the two independent
+            full-path nodes ("summarize" and "retrieve"), which run in parallel
         """
         if state['critical_info_missing']:
             return "conservative"
         else:
-            return "full"
+            return ["summarize", "retrieve"]
 
     def visualize_graph(self, output_path: str = None) -> str:
         """
@@ -206,6 +248,75 @@ class IncidentCopilot:
         Returns:
             Complete response with metadata including validation results
         """
+        initial_state = self._initial_state(incident_report)
+
+        # Run through the graph
+        final_state = self.graph.invoke(initial_state)
+
+        return self._build_result(final_state, verbose)
+
+    async def aprocess(
+        self,
+        incident_report: str,
+        verbose: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Process incident report through the agentic workflow from async code.
+
+        Args:
+            incident_report: Full incident report text from user
+            verbose: Whether to print detailed output
+
+        Returns:
+            Complete response with metadata including validation results
+        """
+        initial_state = self._initial_state(incident_report)
+
+        # Run through the graph (LangGraph runs the synchronous nodes in worker threads)
+        final_state = await self.graph.ainvoke(initial_state)
+
+        return self._build_result(final_state, verbose)
+
+    async def process_batch(
+        self,
+        incident_reports: List[str],
+        concurrency: int = 16,
+        verbose: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        Process several incident reports concurrently.
+
+        Each report still runs through the workflow sequentially; up to
+        concurrency reports are in flight at once, overlapping their
+        Gemini and Pinecone round-trips.
+
+        Args:
+            incident_reports: Full incident report texts
+            concurrency: Maximum number of reports processed at the same time
+            verbose: Whether to print detailed output
+
+        Returns:
+            Results in the same order as incident_reports
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def process_one(incident_report: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.aprocess(incident_report, verbose=verbose)
+
+        return list(await asyncio.gather(*(process_one(report) for report in incident_reports)))
+
+    @staticmethod
+    def _initial_state(incident_report: str) -> CopilotState:
+        """
+        Build the initial workflow state for an incident report.
+
+        Args:
+            incident_report: Full incident report text from user
+
+        Returns:
+            Initial workflow state
+        """
         print(f"\n{'='*60}")
         print(f"INCIDENT COPILOT")
         print(f"{'='*60}")
@@ -213,7 +324,7 @@ class IncidentCopilot:
         print(f"{'='*60}\n")
 
         # Initialize state
-        initial_state: CopilotState = {
+        return {
             'incident_report': incident_report,
             # Validation fields (will be populated by validation node)
             'who': '',
@@ -234,9 +345,18 @@ class IncidentCopilot:
             'error': ''
         }
 
-        # Run through the graph
-        final_state = self.graph.invoke(initial_state)
+    @staticmethod
+    def _build_result(final_state: CopilotState, verbose: bool) -> Dict[str, Any]:
+        """
+        Build the response returned to the caller from the final workflow state.
 
+        Args:
+            final_state: Workflow state after the graph has run
+            verbose: Whether to print detailed output
+
+        Returns:
+            Complete response with metadata including validation results
+        """
         result = {
             'response': final_state['final_response'],
             'summary': final_state['summary'],
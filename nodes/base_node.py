@@ -3,10 +3,51 @@ Base Node Class for Incident Copilot Workflow.
 Provides common interface and utilities for all workflow nodes.
 """
 
-from typing import Dict, Any
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Hashable, Optional
 from abc import ABC, abstractmethod
 
 
+class LRUCache:
+    """Thread-safe, size-bounded mapping that evicts the least recently used entry."""
+
+    def __init__(self, maxsize: int):
+        """
+        Initialize an empty cache.
+
+        Args:
+            maxsize: Maximum number of entries kept
+        """
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Cached value for key (marking it as recently used), or None."""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: Any):
+        """Store value under key, evicting the least recently used entries when full."""
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self):
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
+
+
 class BaseNode(ABC):
     """Base class for all workflow nodes."""
 
@@ -28,7 +69,8 @@ class BaseNode(ABC):
             state: Current workflow state
 
         Returns:
-            Updated state
+            Updated state, or a dict of only the changed keys (required for nodes
+            that run in parallel with another node)
         """
         pass
 
@@ -9,19 +9,74 @@ import google.generativeai as genai
 from .base_node import BaseNode
 from configs.system_prompts import MITIGATION_AGENT_PROMPT
 
+# Static opening turns of every request: system prompt and the model's acknowledgement
+_PREAMBLE = (
+    {'role': 'user', 'parts': [MITIGATION_AGENT_PROMPT]},
+    {'role': 'model', 'parts': ['I understand. I will generate comprehensive, actionable mitigation and response strategies based on the incident summary and historical context.']},
+)
 
-class CompleteMitigationNode(BaseNode):
-    """Validates input and extracts standard information using Validation Agent."""
+# Sampling settings, shared by every request
+_GENERATION_CONFIG = genai.GenerationConfig(temperature=0.7, max_output_tokens=1000)
 
-    def __init__(self, config):
-        """
-        Initialize validation node.
+# Prompt and response templates, filled per request with str.format
 
-        Args:
-            config: RAG configuration object
-        """
-        super().__init__(config)
-        self.mitigation_system_message = MITIGATION_AGENT_PROMPT
+# One few-shot example per retrieved incident
+_EXAMPLE_TEMPLATE = """### Example {number}: {incident_id} ({threat_category})
+**Incident Description:**
+{description}
+
+**Mitigation Strategy:**
+{recommendations}"""
+
+_NO_EXAMPLES = "No similar historical incidents available."
+
+_HUMAN_MESSAGE_TEMPLATE = (
+    "Please generate a mitigation plan for this incident.\n"
+    "\n"
+    "            **CURRENT INCIDENT SUMMARY:**\n"
+    "            {summary}\n"
+    "\n"
+    "            **FEW-SHOT EXAMPLES FROM SIMILAR HISTORICAL INCIDENTS:**\n"
+    "            Below are examples of similar incidents and how they were mitigated. "
+    "Use these as reference to create a comprehensive mitigation plan for the current incident.\n"
+    "\n"
+    "            {few_shot_examples}\n"
+    "\n"
+    "            Based on the current incident summary and the few-shot examples above, "
+    "please provide a comprehensive mitigation plan."
+)
+
+# Analysis context appended to the final response, one line per retrieved incident
+_CONTEXT_LINE_TEMPLATE = "- **{incident_id}**: {threat_category} (Similarity: {score:.2f})"
+
+_CONTEXT_TEMPLATE = (
+    "\n"
+    "                \n"
+    "                ---\n"
+    "                **Analysis Context**\n"
+    "                Mitigation plan based on {num_incidents} similar historical incident(s):\n"
+    "                {context_lines}\n"
+    "            "
+)
+
+_FINAL_RESPONSE_TEMPLATE = (
+    "## Incident Summary\n"
+    "\n"
+    "            {summary}\n"
+    "            \n"
+    "            ---\n"
+    "            \n"
+    "            ## Mitigation Plan\n"
+    "            \n"
+    "            {mitigation_plan}{context_info}"
+)
+
+# Maximum number of retrieved incidents used as few-shot examples and listed as context
+_MAX_EXAMPLES = 3
+
+
+class CompleteMitigationNode(BaseNode):
+    """Validates input and extracts standard information using Validation Agent."""
 
     def execute(self, state: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -38,68 +93,55 @@ class CompleteMitigationNode(BaseNode):
 
             # Build few-shot examples from retrieved similar incidents
             # Each example contains both the incident description and its mitigation recommendations
-            if state['retrieved_incidents']:
+            examples = state['retrieved_incidents'][:_MAX_EXAMPLES]
+            if examples:
                 few_shot_examples = "\n\n".join([
-                    f"""### Example {i}: {inc['incident_id']} ({inc['metadata'].get('threat_category', 'Unknown')})
-**Incident Description:**
-{inc['description']}
-
-**Mitigation Strategy:**
-{inc['recommendations']}"""
-                    for i, inc in enumerate(state['retrieved_incidents'][:3], 1)
+                    _EXAMPLE_TEMPLATE.format(
+                        number=i,
+                        incident_id=inc['incident_id'],
+                        threat_category=inc['metadata'].get('threat_category', 'Unknown'),
+                        description=inc['description'],
+                        recommendations=inc['recommendations']
+                    )
+                    for i, inc in enumerate(examples, 1)
                 ])
             else:
-                few_shot_examples = "No similar historical incidents available."
+                few_shot_examples = _NO_EXAMPLES
 
             # Human message with incident summary and few-shot examples
-            human_message = f"""Please generate a mitigation plan for this incident.
-
-            **CURRENT INCIDENT SUMMARY:**
-            {state['summary']}
-
-            **FEW-SHOT EXAMPLES FROM SIMILAR HISTORICAL INCIDENTS:**
-            Below are examples of similar incidents and how they were mitigated. Use these as reference to create a comprehensive mitigation plan for the current incident.
-
-            {few_shot_examples}
-
-            Based on the current incident summary and the few-shot examples above, please provide a comprehensive mitigation plan."""
+            human_message = _HUMAN_MESSAGE_TEMPLATE.format(
+                summary=state['summary'],
+                few_shot_examples=few_shot_examples
+            )
 
             # Call Mitigation Agent with system/human messages
             response = self.config.gemini_model.generate_content(
-                [
-                    {'role': 'user', 'parts': [self.mitigation_system_message]},
-                    {'role': 'model', 'parts': ['I understand. I will generate comprehensive, actionable mitigation and response strategies based on the incident summary and historical context.']},
-                    {'role': 'user', 'parts': [human_message]}
-                ],
-                generation_config=genai.GenerationConfig(
-                    temperature=0.7,
-                    max_output_tokens=1000
-                )
+                [*_PREAMBLE, {'role': 'user', 'parts': [human_message]}],
+                generation_config=_GENERATION_CONFIG
             )
 
             state['mitigation_plan'] = response.text.strip()
 
             # Format final response: Summary + Mitigation Plan + Context Info
             context_info = ""
-            if state['retrieved_incidents']:
-                context_info = f"""
-                
-                ---
-                **Analysis Context**
-                Mitigation plan based on {len(state['retrieved_incidents'])} similar historical incident(s):
-                {chr(10).join([f"- **{inc['incident_id']}**: {inc['metadata'].get('threat_category', 'N/A')} (Similarity: {inc.get('score', 0):.2f})"
-               for inc in state['retrieved_incidents'][:3]])}
-            """
-
-            state['final_response'] = f"""## Incident Summary
-
-            {state['summary']}
-            
-            ---
-            
-            ## Mitigation Plan
-            
-            {state['mitigation_plan']}{context_info}"""
+            if examples:
+                context_info = _CONTEXT_TEMPLATE.format(
+                    num_incidents=len(state['retrieved_incidents']),
+                    context_lines="\n".join([
+                        _CONTEXT_LINE_TEMPLATE.format(
+                            incident_id=inc['incident_id'],
+                            threat_category=inc['metadata'].get('threat_category', 'N/A'),
+                            score=inc.get('score', 0)
+                        )
+                        for inc in examples
+                    ])
+                )
+
+            state['final_response'] = _FINAL_RESPONSE_TEMPLATE.format(
+                summary=state['summary'],
+                mitigation_plan=state['mitigation_plan'],
+                context_info=context_info
+            )
 
             print(f"[Mitigation Agent] Plan generated ({len(state['mitigation_plan'])} chars)")
 
@@ -9,19 +9,18 @@ import google.generativeai as genai
 from .base_node import BaseNode
 from configs.system_prompts import SUMMARIZATION_AGENT_PROMPT
 
+# Static opening turns of every request: system prompt and the model's acknowledgement
+_PREAMBLE = (
+    {'role': 'user', 'parts': [SUMMARIZATION_AGENT_PROMPT]},
+    {'role': 'model', 'parts': ['I understand. I will provide concise, executive-level summaries of security incidents following the specified format.']},
+)
 
-class CompleteSummarizationNode(BaseNode):
-    """Validates input and extracts standard information using Validation Agent."""
+# Sampling settings, shared by every request
+_GENERATION_CONFIG = genai.GenerationConfig(temperature=0.5, max_output_tokens=300)
 
-    def __init__(self, config):
-        """
-        Initialize validation node.
 
-        Args:
-            config: RAG configuration object
-        """
-        super().__init__(config)
-        self.summarization_system_message = SUMMARIZATION_AGENT_PROMPT
+class CompleteSummarizationNode(BaseNode):
+    """Validates input and extracts standard information using Validation Agent."""
 
     def execute(self, state: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -31,7 +30,7 @@ class CompleteSummarizationNode(BaseNode):
             state: Current workflow state
 
         Returns:
-            Updated state with summary
+            State update with the summary (partial, as this node runs in parallel with retrieval)
         """
         try:
             print(f"\n[Summarization Agent] Generating summary...")
@@ -44,24 +43,19 @@ class CompleteSummarizationNode(BaseNode):
 
             # Call Summarization Agent with system/human messages
             response = self.config.gemini_model.generate_content(
-                [
-                    {'role': 'user', 'parts': [self.summarization_system_message]},
-                    {'role': 'model', 'parts': ['I understand. I will provide concise, executive-level summaries of security incidents following the specified format.']},
-                    {'role': 'user', 'parts': [human_message]}
-                ],
-                generation_config=genai.GenerationConfig(
-                    temperature=0.5,
-                    max_output_tokens=300
-                )
+                [*_PREAMBLE, {'role': 'user', 'parts': [human_message]}],
+                generation_config=_GENERATION_CONFIG
             )
 
-            state['summary'] = response.text.strip()
+            summary = response.text.strip()
 
-            print(f"[Summarization Agent] Summary generated ({len(state['summary'])} chars)")
+            print(f"[Summarization Agent] Summary generated ({len(summary)} chars)")
+
+            return {'summary': summary}
 
         except Exception as e:
-            state['error'] = f"Error in summarization: {str(e)}"
-            state['summary'] = f"Error generating summary: {str(e)}"
             print(f"[Summarization Agent] Error: {e}")
-
-        return state
\ No newline at end of file
+            return {
+                'error': f"Error in summarization: {str(e)}",
+                'summary': f"Error generating summary: {str(e)}"
+            }
\ No newline at end of file
@@ -9,19 +9,18 @@ import google.generativeai as genai
 from .base_node import BaseNode
 from configs.system_prompts import CONSERVATIVE_NEXTSTEPS_AGENT_PROMPT
 
+# Static opening turns of every request: system prompt and the model's acknowledgement
+_PREAMBLE = (
+    {'role': 'user', 'parts': [CONSERVATIVE_NEXTSTEPS_AGENT_PROMPT]},
+    {'role': 'model', 'parts': ['I understand. I will provide conservative, cautious next steps focused on information gathering and basic precautionary measures. This is NOT a full mitigation plan.']},
+)
 
-class ConservativeNextStepsNode(BaseNode):
-    """Validates input and extracts standard information using Validation Agent."""
+# Sampling settings, shared by every request
+_GENERATION_CONFIG = genai.GenerationConfig(temperature=0.4, max_output_tokens=500)
 
-    def __init__(self, config):
-        """
-        Initialize validation node.
 
-        Args:
-            config: RAG configuration object
-        """
-        super().__init__(config)
-        self.conservative_nextsteps_system_message = CONSERVATIVE_NEXTSTEPS_AGENT_PROMPT
+class ConservativeNextStepsNode(BaseNode):
+    """Validates input and extracts standard information using Validation Agent."""
 
     def execute(self, state: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -50,15 +49,8 @@ class ConservativeNextStepsNode(BaseNode):
 
             # Call Conservative Next Steps Agent with system/human messages
             response = self.config.gemini_model.generate_content(
-                [
-                    {'role': 'user', 'parts': [self.conservative_nextsteps_system_message]},
-                    {'role': 'model', 'parts': ['I understand. I will provide conservative, cautious next steps focused on information gathering and basic precautionary measures. This is NOT a full mitigation plan.']},
-                    {'role': 'user', 'parts': [human_message]}
-                ],
-                generation_config=genai.GenerationConfig(
-                    temperature=0.4,
-                    max_output_tokens=500
-                )
+                [*_PREAMBLE, {'role': 'user', 'parts': [human_message]}],
+                generation_config=_GENERATION_CONFIG
             )
 
             conservative_nextsteps = response.text.strip()
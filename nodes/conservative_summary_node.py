@@ -9,19 +9,18 @@ import google.generativeai as genai
 from .base_node import BaseNode
 from configs.system_prompts import CONSERVATIVE_SUMMARY_AGENT_PROMPT
 
+# Static opening turns of every request: system prompt and the model's acknowledgement
+_PREAMBLE = (
+    {'role': 'user', 'parts': [CONSERVATIVE_SUMMARY_AGENT_PROMPT]},
+    {'role': 'model', 'parts': ['I understand. I will provide a faithful, conservative summary based ONLY on what is explicitly stated in the report, and clearly identify missing critical information.']},
+)
 
-class ConservativeSummaryNode(BaseNode):
-    """Validates input and extracts standard information using Validation Agent."""
+# Sampling settings, shared by every request
+_GENERATION_CONFIG = genai.GenerationConfig(temperature=0.3, max_output_tokens=300)
 
-    def __init__(self, config):
-        """
-        Initialize validation node.
 
-        Args:
-            config: RAG configuration object
-        """
-        super().__init__(config)
-        self.conservative_summary_system_message = CONSERVATIVE_SUMMARY_AGENT_PROMPT
+class ConservativeSummaryNode(BaseNode):
+    """Validates input and extracts standard information using Validation Agent."""
 
     def execute(self, state: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -43,15 +42,8 @@ class ConservativeSummaryNode(BaseNode):
 
             # Call Conservative Summary Agent with system/human messages
             response = self.config.gemini_model.generate_content(
-                [
-                    {'role': 'user', 'parts': [self.conservative_summary_system_message]},
-                    {'role': 'model', 'parts': ['I understand. I will provide a faithful, conservative summary based ONLY on what is explicitly stated in the report, and clearly identify missing critical information.']},
-                    {'role': 'user', 'parts': [human_message]}
-                ],
-                generation_config=genai.GenerationConfig(
-                    temperature=0.3,
-                    max_output_tokens=300
-                )
+                [*_PREAMBLE, {'role': 'user', 'parts': [human_message]}],
+                generation_config=_GENERATION_CONFIG
             )
 
             state['summary'] = response.text.strip()
@@ -3,11 +3,39 @@ Retriever Node - Searches for similar historical incidents using semantic search
 Uses the description namespace to find similar incidents and retrieves recommendations.
 """
 
-from typing import Dict, Any
+import hashlib
+from typing import Dict, Any, List
 
-from .base_node import BaseNode
+from .base_node import BaseNode, LRUCache
 from data_handling.embeddings import embed_query
-from data_handling.vector_store import VectorStore
+from data_handling.vector_store import upsert_generation
+
+# Match metadata kept for each retrieved incident (only what downstream nodes read);
+# section text, hashes and sibling references are dropped so state stays small
+_INCIDENT_METADATA_FIELDS = ('threat_category',)
+
+# Maximum number of search queries whose retrieval results are kept in memory
+RETRIEVAL_CACHE_SIZE = 256
+
+# Query key -> (retrieved_incidents, retrieved_recommendations)
+_RETRIEVAL_CACHE = LRUCache(RETRIEVAL_CACHE_SIZE)
+
+
+def _retrieval_cache_key(index_name: str, embedding_model: str, search_query: str) -> str:
+    """
+    Cache key for a search query, normalized so whitespace-only differences still hit.
+
+    The key includes the vector store's upsert generation, so anything upserted in this
+    process since a query was cached (e.g. a new ingestion run) makes that entry miss.
+    """
+    normalized_query = " ".join(search_query.split())
+    key = f"{upsert_generation()}\0{index_name}\0{embedding_model}\0{normalized_query}"
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+
+def _copy_incidents(retrieved_incidents: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Copy incident dicts (and their metadata), so callers and the cache never share them."""
+    return [{**incident, 'metadata': dict(incident['metadata'])} for incident in retrieved_incidents]
 
 
 class RetrieverNode(BaseNode):
@@ -21,7 +49,7 @@ class RetrieverNode(BaseNode):
             config: RAG configuration object
         """
         super().__init__(config)
-        self.vector_store = VectorStore(config.index, config.embedding_model)
+        self.vector_store = config.vector_store
 
     def execute(self, state: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -32,7 +60,8 @@ class RetrieverNode(BaseNode):
             state: Current workflow state
 
         Returns:
-            Updated state with retrieved similar incidents and recommendations
+            State update with retrieved similar incidents and recommendations
+            (partial, as this node runs in parallel with summarization)
         """
         try:
             print(f"\n[Retriever] Searching for similar incidents based on description...")
@@ -40,6 +69,17 @@ class RetrieverNode(BaseNode):
             # Use the description from the user's incident for searching
             search_query = state['description']
 
+            # Identical (normalized) queries were already retrieved: skip embedding and Pinecone
+            cache_key = _retrieval_cache_key(self.config.index_name, self.config.embedding_model, search_query)
+            cached = _RETRIEVAL_CACHE.get(cache_key)
+            if cached is not None:
+                retrieved_incidents, retrieved_recommendations = cached
+                print(f"[Retriever] Reusing {len(retrieved_incidents)} cached similar incidents")
+                return {
+                    'retrieved_incidents': _copy_incidents(retrieved_incidents),
+                    'retrieved_recommendations': list(retrieved_recommendations)
+                }
+
             # Embed the search query using shared embedding function
             print("[Retriever] Generating query embedding...")
             query_embedding = embed_query(search_query, self.config.embedding_model)
@@ -53,9 +93,18 @@ class RetrieverNode(BaseNode):
                 include_metadata=True
             )
 
-            # Extract both description and recommendations from the results
-            # Each description in the metadata contains section_recommendations_text
-            state['retrieved_incidents'] = []
+            # Extract both description and recommendations from the results.
+            # Recommendations are fetched by ID from each incident's sibling 'recommendations'
+            # vector; older indexes carry them inline as section_recommendations_text.
+            report_ids = [
+                match.metadata['report_id'] for match in description_results.matches
+                if 'section_recommendations_text' not in match.metadata and 'report_id' in match.metadata
+            ]
+            sibling_recommendations = self.vector_store.fetch_section_texts(
+                list(dict.fromkeys(report_ids)), 'recommendations'
+            )
+
+            retrieved_incidents = []
             seen_ids = set()
 
             for match in description_results.matches:
@@ -64,38 +113,52 @@ class RetrieverNode(BaseNode):
                     # Get description text (the main embedded text)
                     description_text = match.metadata.get('text', '')
 
-                    # Get recommendations text from metadata (cross-section reference)
-                    recommendations_text = match.metadata.get('section_recommendations_text', '')
+                    # Get recommendations text (inline in older indexes, otherwise from the sibling vector)
+                    recommendations_text = match.metadata.get(
+                        'section_recommendations_text',
+                        sibling_recommendations.get(match.metadata.get('report_id'), '')
+                    )
 
-                    state['retrieved_incidents'].append({
+                    retrieved_incidents.append({
                         'incident_id': incident_id,
                         'description': description_text,
                         'recommendations': recommendations_text,
-                        'metadata': match.metadata,
+                        'metadata': {
+                            field: match.metadata[field]
+                            for field in _INCIDENT_METADATA_FIELDS if field in match.metadata
+                        },
                         'score': match.score
                     })
                     seen_ids.add(incident_id)
 
             # Print retrieved incidents with both description and recommendations
-            print(f"\n[Retriever] Found {len(state['retrieved_incidents'])} similar incidents:")
-            for i, incident in enumerate(state['retrieved_incidents'], 1):
-                print(f"\n  [{i}] Incident ID: {incident['incident_id']}")
-                print(f"      Similarity Score: {incident['score']:.4f}")
-                print(f"      Threat Category: {incident['metadata'].get('threat_category', 'N/A')}")
-                print(f"      Description Preview: {incident['description'][:150]}...")
-                print(f"      Recommendations Preview: {incident['recommendations'][:150]}...")
+            # (collected into a single write rather than five prints per incident)
+            lines = [f"\n[Retriever] Found {len(retrieved_incidents)} similar incidents:"]
+            for i, incident in enumerate(retrieved_incidents, 1):
+                lines.append(f"\n  [{i}] Incident ID: {incident['incident_id']}")
+                lines.append(f"      Similarity Score: {incident['score']:.4f}")
+                lines.append(f"      Threat Category: {incident['metadata'].get('threat_category', 'N/A')}")
+                lines.append(f"      Description Preview: {incident['description'][:150]}...")
+                lines.append(f"      Recommendations Preview: {incident['recommendations'][:150]}...")
+            print("\n".join(lines))
 
             # For backward compatibility, also populate retrieved_recommendations
             # (extracting recommendations from the incidents we found)
-            state['retrieved_recommendations'] = []
-            for incident in state['retrieved_incidents']:
-                if incident['recommendations']:
-                    state['retrieved_recommendations'].append(incident['recommendations'])
+            retrieved_recommendations = [
+                incident['recommendations'] for incident in retrieved_incidents if incident['recommendations']
+            ]
+
+            _RETRIEVAL_CACHE.put(cache_key, (_copy_incidents(retrieved_incidents), list(retrieved_recommendations)))
+
+            return {
+                'retrieved_incidents': retrieved_incidents,
+                'retrieved_recommendations': retrieved_recommendations
+            }
 
         except Exception as e:
-            state['error'] = f"Error in retrieval: {str(e)}"
-            state['retrieved_incidents'] = []
-            state['retrieved_recommendations'] = []
             print(f"[Retriever] Error: {e}")
-
-        return state
\ No newline at end of file
+            return {
+                'error': f"Error in retrieval: {str(e)}",
+                'retrieved_incidents': [],
+                'retrieved_recommendations': []
+            }
\ No newline at end of file
@@ -3,26 +3,76 @@ Validation Node - Extracts standard information from incident reports.
 Uses the Validation Agent to extract WHO, WHAT, WHERE, WHEN, IMPACT, STATUS.
 """
 
-import re
-from typing import Dict, Any
+import asyncio
+import hashlib
+from typing import Dict, Any, List, Optional, Tuple
 import google.generativeai as genai
 
-from .base_node import BaseNode
+from .base_node import BaseNode, LRUCache
 from configs.system_prompts import VALIDATION_AGENT_PROMPT
+from data_handling.retry import retry_with_backoff
 
+# Static opening turns of every request: system prompt and the model's acknowledgement
+_PREAMBLE = (
+    {'role': 'user', 'parts': [VALIDATION_AGENT_PROMPT]},
+    {'role': 'model', 'parts': ['I understand. I will extract WHO, WHAT, WHERE, WHEN, IMPACT, and STATUS information from the incident report.']},
+)
 
-class ValidationNode(BaseNode):
-    """Validates input and extracts standard information using Validation Agent."""
+# Sampling settings, shared by every request; six fields of 1-2 sentences fit well within 300 tokens
+_GENERATION_CONFIG = genai.GenerationConfig(temperature=0.3, max_output_tokens=300)
 
-    def __init__(self, config):
-        """
-        Initialize validation node.
+# Gemini errors retried with backoff: rate limited, internal error, unavailable, deadline exceeded
+_TRANSIENT_STATUS_CODES = frozenset([429, 500, 503, 504])
 
-        Args:
-            config: RAG configuration object
-        """
-        super().__init__(config)
-        self.system_message = VALIDATION_AGENT_PROMPT
+# Extracted fields: (state key, label, labels that end the value early).
+# A value runs from its label to the first blank line, stop label or end of the response.
+_FIELD_LABELS = (
+    ('who', 'WHO:', ('\nWHAT:', '\nWHERE:')),
+    ('what', 'WHAT:', ('\nWHERE:', '\nWHEN:')),
+    ('where', 'WHERE:', ('\nWHEN:', '\nIMPACT:')),
+    ('when', 'WHEN:', ('\nIMPACT:', '\nSTATUS:')),
+    ('impact', 'IMPACT:', ('\nSTATUS:',)),
+    ('status', 'STATUS:', ()),
+)
+
+# Values used when nothing could be extracted (description is set from the report separately)
+_DEFAULT_VALUES = {field: "Unknown" for field, _, _ in _FIELD_LABELS}
+_DEFAULT_VALUES['critical_info_missing'] = True
+
+# Reports with at least this many field labels at line starts are parsed without the LLM
+_STRUCTURED_MIN_LABELS = 4
+
+# Label -> state key, for parsing structured reports line by line
+_STRUCTURED_LABELS = {label: field for field, label, _ in _FIELD_LABELS}
+
+# Extracted values that count as missing
+_MISSING_VALUES = frozenset(['unknown', 'not specified', ''])
+
+# Fields required for the complete path; if any is missing the conservative path is taken
+_CRITICAL_FIELDS = ('what', 'where', 'when')
+
+# State keys produced by validation, cached per incident report
+_VALIDATION_KEYS = ('who', 'what', 'where', 'when', 'impact', 'status', 'critical_info_missing', 'description')
+
+# Maximum number of incident reports whose validation results are kept in memory
+VALIDATION_CACHE_SIZE = 1024
+
+# Report key -> validation state fields
+_VALIDATION_CACHE = LRUCache(VALIDATION_CACHE_SIZE)
+
+
+def _validation_cache_key(model_name: str, incident_report: str) -> str:
+    """Cache key for an incident report validated by a given model."""
+    return hashlib.sha256(f"{model_name}\0{incident_report}".encode('utf-8')).hexdigest()
+
+
+def _is_transient(error: Exception) -> bool:
+    """Whether a Gemini API error has a transient HTTP status worth retrying."""
+    return getattr(error, 'code', None) in _TRANSIENT_STATUS_CODES
+
+
+class ValidationNode(BaseNode):
+    """Validates input and extracts standard information using Validation Agent."""
 
     def execute(self, state: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -39,34 +89,41 @@ class ValidationNode(BaseNode):
 
             incident_report = state['incident_report']
 
+            # Nothing to extract from an empty report: skip the LLM call
+            if not incident_report.strip():
+                self._set_default_values(state)
+                print(f"[Validation Agent] Empty incident report, critical info missing")
+                return state
+
+            # Report already in "LABEL: value" form (e.g. a SIEM export): parse it directly
+            if self._is_structured(incident_report):
+                print(f"[Validation Agent] Report already structured, extracting without LLM")
+                self._parse_structured_report(state, incident_report)
+                self._update_routing_fields(state)
+                self._print_extracted_info(state)
+                return state
+
+            # Identical reports were already validated: skip the LLM call
+            cache_key = _validation_cache_key(self.config.model_name, incident_report)
+            cached = _VALIDATION_CACHE.get(cache_key)
+            if cached is not None:
+                state.update(cached)
+                print(f"[Validation Agent] Reusing cached extraction")
+                self._print_extracted_info(state)
+                return state
+
             # Human message requesting information extraction
             human_message = f"Please extract the standard information from this incident report:\n\n{incident_report}"
 
             # Call Validation Agent with system/human messages
-            response = self.config.gemini_model.generate_content(
-                [
-                    {'role': 'user', 'parts': [self.system_message]},
-                    {'role': 'model', 'parts': ['I understand. I will extract WHO, WHAT, WHERE, WHEN, IMPACT, and STATUS information from the incident report.']},
-                    {'role': 'user', 'parts': [human_message]}
-                ],
-                generation_config=genai.GenerationConfig(
-                    temperature=0.3,
-                    max_output_tokens=500
-                )
-            )
+            response = self._generate(human_message)
 
             # Parse the response to extract each field
             response_text = response.text.strip()
             self._parse_and_update_state(state, response_text)
+            self._update_routing_fields(state)
 
-            # Check if critical information is missing (WHAT, WHERE, WHEN)
-            what_missing = state['what'].lower() in ['unknown', 'not specified', '']
-            where_missing = state['where'].lower() in ['unknown', 'not specified', '']
-            when_missing = state['when'].lower() in ['unknown', 'not specified', '']
-            state['critical_info_missing'] = what_missing or where_missing or when_missing
-
-            # Also extract description for retrieval (use 'what' as description if present)
-            state['description'] = state['what'] if state['what'] != "Unknown" else incident_report[:500]
+            _VALIDATION_CACHE.put(cache_key, {key: state[key] for key in _VALIDATION_KEYS})
 
             self._print_extracted_info(state)
 
@@ -77,40 +134,130 @@ class ValidationNode(BaseNode):
 
         return state
 
+    def _generate(self, human_message: str):
+        """Call the Validation Agent, retrying transient Gemini errors with jittered exponential backoff."""
+        return retry_with_backoff(
+            lambda: self.config.gemini_model.generate_content(
+                [*_PREAMBLE, {'role': 'user', 'parts': [human_message]}],
+                generation_config=_GENERATION_CONFIG
+            ),
+            _is_transient,
+            description="[Validation Agent] Gemini call"
+        )
+
+    async def execute_many(self, states: List[Dict[str, Any]], max_concurrency: int = 16) -> List[Dict[str, Any]]:
+        """
+        Validate several incident reports concurrently from async code.
+
+        Each state goes through execute in the event loop's default executor,
+        so up to max_concurrency Gemini calls overlap instead of running back to back.
+
+        Args:
+            states: Workflow states, each with an incident_report
+            max_concurrency: Maximum number of validation calls in flight
+
+        Returns:
+            Updated states, in the same order as states
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        loop = asyncio.get_running_loop()
+
+        async def validate(state: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                return await loop.run_in_executor(None, self.execute, state)
+
+        return list(await asyncio.gather(*(validate(state) for state in states)))
+
+    @staticmethod
+    def _is_structured(incident_report: str) -> bool:
+        """Whether the report itself starts lines with enough field labels to be parsed directly."""
+        labels_present = sum(
+            1 for _, label, _ in _FIELD_LABELS
+            if incident_report.startswith(label) or f"\n{label}" in incident_report
+        )
+        return labels_present >= _STRUCTURED_MIN_LABELS
+
+    @staticmethod
+    def _parse_structured_report(state: Dict[str, Any], incident_report: str):
+        """
+        Update state with fields from a report that already has "LABEL: value" lines.
+
+        Unlike LLM responses, raw exports may list the labels in any order and mix in
+        other lines, so each value is taken from its own line only.
+
+        Args:
+            state: Current workflow state
+            incident_report: Structured incident report (see _is_structured)
+        """
+        for field, _, _ in _FIELD_LABELS:
+            state[field] = "Unknown"
+
+        found = set()
+        for line in incident_report.splitlines():
+            head, separator, value = line.partition(':')
+            field = _STRUCTURED_LABELS.get(head + separator)
+            if field is not None and field not in found:
+                state[field] = value.strip()
+                found.add(field)
+
+    @staticmethod
+    def _update_routing_fields(state: Dict[str, Any]):
+        """Set critical_info_missing and description from the extracted fields."""
+        # Check if critical information is missing (WHAT, WHERE, WHEN)
+        state['critical_info_missing'] = any(
+            state[field].lower() in _MISSING_VALUES for field in _CRITICAL_FIELDS
+        )
+
+        # Also extract description for retrieval (use 'what' as description if present)
+        state['description'] = state['what'] if state['what'] != "Unknown" else state['incident_report'][:500]
+
     def _parse_and_update_state(self, state: Dict[str, Any], response_text: str):
         """Parse LLM response and update state with extracted fields."""
-        who_match = re.search(r'WHO:\s*(.+?)(?=\nWHAT:|\nWHERE:|\n\n|$)', response_text, re.DOTALL)
-        what_match = re.search(r'WHAT:\s*(.+?)(?=\nWHERE:|\nWHEN:|\n\n|$)', response_text, re.DOTALL)
-        where_match = re.search(r'WHERE:\s*(.+?)(?=\nWHEN:|\nIMPACT:|\n\n|$)', response_text, re.DOTALL)
-        when_match = re.search(r'WHEN:\s*(.+?)(?=\nIMPACT:|\nSTATUS:|\n\n|$)', response_text, re.DOTALL)
-        impact_match = re.search(r'IMPACT:\s*(.+?)(?=\nSTATUS:|\n\n|$)', response_text, re.DOTALL)
-        status_match = re.search(r'STATUS:\s*(.+?)(?=\n\n|$)', response_text, re.DOTALL)
-
-        state['who'] = who_match.group(1).strip() if who_match else "Unknown"
-        state['what'] = what_match.group(1).strip() if what_match else "Unknown"
-        state['where'] = where_match.group(1).strip() if where_match else "Unknown"
-        state['when'] = when_match.group(1).strip() if when_match else "Unknown"
-        state['impact'] = impact_match.group(1).strip() if impact_match else "Unknown"
-        state['status'] = status_match.group(1).strip() if status_match else "Unknown"
+        for field, label, stop_labels in _FIELD_LABELS:
+            value = self._extract_field(response_text, label, stop_labels)
+            state[field] = value if value is not None else "Unknown"
+
+    @staticmethod
+    def _extract_field(response_text: str, label: str, stop_labels: Tuple[str, ...]) -> Optional[str]:
+        """
+        Extract the value following the first occurrence of label, using plain substring search.
+
+        Args:
+            response_text: LLM response text
+            label: Field label (e.g. "WHO:")
+            stop_labels: Labels that end the value when they start a new line
+
+        Returns:
+            Stripped field value, or None if the label is absent or ends the response
+        """
+        label_pos = response_text.find(label)
+        if label_pos == -1:
+            return None
+
+        remainder = response_text[label_pos + len(label):]
+        value = remainder.lstrip()
+        if not value:
+            return '' if remainder else None
+
+        # The value ends at the first blank line or stop label, or before a trailing newline
+        value_start = len(response_text) - len(value)
+        value_end = len(response_text) - 1 if response_text.endswith('\n') else len(response_text)
+        for stop in ('\n\n', *stop_labels):
+            stop_pos = response_text.find(stop, value_start + 1, value_end)
+            if stop_pos != -1:
+                value_end = stop_pos
+
+        return response_text[value_start:value_end].strip()
 
     def _set_default_values(self, state: Dict[str, Any]):
         """Set default values when extraction fails."""
-        state['who'] = "Unknown"
-        state['what'] = "Unknown"
-        state['where'] = "Unknown"
-        state['when'] = "Unknown"
-        state['impact'] = "Unknown"
-        state['status'] = "Unknown"
-        state['critical_info_missing'] = True
+        state.update(_DEFAULT_VALUES)
         state['description'] = state['incident_report'][:500]
 
     def _print_extracted_info(self, state: Dict[str, Any]):
-        """Print extracted information for debugging."""
-        print(f"[Validation Agent] Extracted information:")
-        print(f"  WHO: {state['who'][:50]}...")
-        print(f"  WHAT: {state['what'][:50]}...")
-        print(f"  WHERE: {state['where'][:50]}...")
-        print(f"  WHEN: {state['when'][:50]}...")
-        print(f"  IMPACT: {state['impact'][:50]}...")
-        print(f"  STATUS: {state['status'][:50]}...")
-        print(f"  Critical info missing: {state['critical_info_missing']}")
\ No newline at end of file
+        """Print extracted information for debugging (as a single write, so concurrent reports don't interleave)."""
+        lines = [f"[Validation Agent] Extracted information:"]
+        for field, label, _ in _FIELD_LABELS:
+            lines.append(f"  {label} {state[field]:.50s}...")
+        lines.append(f"  Critical info missing: {state['critical_info_missing']}")
+        print("\n".join(lines))